@@ -4,7 +4,8 @@ Handles API keys, settings, and environment variables.
 """
 
 import os
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
 from dotenv import load_dotenv
 from src.language_mapping import LanguageMapping, TranslationService
 
@@ -26,17 +27,41 @@ class Config:
     NEO4J_USERNAME: Optional[str] = None
     NEO4J_PASSWORD: Optional[str] = None
     
+    # OpenAI settings
+    OPENAI_MAX_CONCURRENCY: int = 5  # Concurrent async chat completion requests
+    
     # Translation Service Configuration
     TRANSLATION_SERVICE: str = "google_cloud"  # Default service
     NLLB_MODEL_NAME: str = "facebook/nllb-200-distilled-600M"
+    NLLB_BATCH_SIZE: int = 16  # Chunks per generate() call
+    NLLB_QUANTIZATION: str = "none"  # "none" or "int8"
+    NLLB_CT2_MODEL_DIR: str = "models/nllb-ct2"  # CTranslate2 export, used when present
+    NLLB_TORCH_COMPILE: bool = False
+    
+    # Language detection (fastText lid.176 model, optional)
+    LANGUAGE_ID_MODEL_PATH: str = "models/lid.176.ftz"
     
     # App Settings
     MAX_FILE_SIZE_MB: int = 50
     MAX_CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    EMBED_BATCH_SIZE: int = 64  # Chunks per embedding forward pass (16/32/64)
+    EMBED_DEVICE: str = "auto"  # "auto", "cuda", "mps" or "cpu"
+    EMBED_ONNX_MODEL_DIR: str = "models/minilm-onnx"  # ONNX export, used on CPU when present
+    EMBED_NUM_THREADS: int = 0  # CPU embedding threads (PyTorch or ONNX Runtime); 0 uses all cores
+    
+    # Retrieval settings (maximal marginal relevance reranking)
+    RETRIEVAL_MMR: bool = True
+    RETRIEVAL_MMR_LAMBDA: float = 0.5  # 1.0 = pure relevance, 0.0 = pure diversity
+    RETRIEVAL_MMR_FETCH_FACTOR: int = 4  # Candidates fetched per returned chunk
+    
+    # Vector index (ChromaDB HNSW) settings
+    HNSW_M: int = 32
+    HNSW_EF_CONSTRUCTION: int = 200
+    HNSW_EF_SEARCH: int = 64
     
     # Legacy supported languages (kept for backward compatibility)
-    SUPPORTED_LANGUAGES = {
+    SUPPORTED_LANGUAGES: Mapping[str, str] = MappingProxyType({
         'en': 'English',
         'es': 'Spanish', 
         'fr': 'French',
@@ -58,7 +83,7 @@ class Config:
         'kn': 'Kannada',
         'ml': 'Malayalam',
         'pa': 'Punjabi'
-    }
+    })
     
     @classmethod
     def load_config(cls):
@@ -74,12 +99,29 @@ class Config:
         cls.NEO4J_USERNAME = os.getenv("NEO4J_USERNAME")
         cls.NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
         
+        cls.OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", 5))
+        
         # Translation service configuration
         cls.TRANSLATION_SERVICE = os.getenv("TRANSLATION_SERVICE", "google_cloud")
         cls.NLLB_MODEL_NAME = os.getenv("NLLB_MODEL_NAME", "facebook/nllb-200-distilled-600M")
+        cls.NLLB_BATCH_SIZE = int(os.getenv("NLLB_BATCH_SIZE", 16))
+        cls.NLLB_QUANTIZATION = os.getenv("NLLB_QUANTIZATION", "none").lower()
+        cls.NLLB_CT2_MODEL_DIR = os.getenv("NLLB_CT2_MODEL_DIR", "models/nllb-ct2")
+        cls.NLLB_TORCH_COMPILE = os.getenv("NLLB_TORCH_COMPILE", "false").lower() in ["true", "1", "yes"]
+        cls.LANGUAGE_ID_MODEL_PATH = os.getenv("LANGUAGE_ID_MODEL_PATH", "models/lid.176.ftz")
         
         # Load other settings
         cls.MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", 50))
+        cls.EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 64))
+        cls.EMBED_DEVICE = os.getenv("EMBED_DEVICE", "auto").lower()
+        cls.EMBED_ONNX_MODEL_DIR = os.getenv("EMBED_ONNX_MODEL_DIR", "models/minilm-onnx")
+        cls.EMBED_NUM_THREADS = int(os.getenv("EMBED_NUM_THREADS", 0))
+        cls.RETRIEVAL_MMR = os.getenv("RETRIEVAL_MMR", "true").lower() in ["true", "1", "yes"]
+        cls.RETRIEVAL_MMR_LAMBDA = float(os.getenv("RETRIEVAL_MMR_LAMBDA", 0.5))
+        cls.RETRIEVAL_MMR_FETCH_FACTOR = int(os.getenv("RETRIEVAL_MMR_FETCH_FACTOR", 4))
+        cls.HNSW_M = int(os.getenv("HNSW_M", 32))
+        cls.HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", 200))
+        cls.HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 64))
         
     @classmethod
     def validate_config(cls) -> tuple[bool, list[str]]:
@@ -106,7 +148,7 @@ class Config:
         return len(errors) == 0, errors
     
     @classmethod
-    def get_language_options(cls, service: Optional[str] = None) -> list[tuple[str, str]]:
+    def get_language_options(cls, service: Optional[str] = None) -> Sequence[tuple[str, str]]:
         """Get language options for UI selection based on translation service."""
         if service == "google_cloud":
             return LanguageMapping.get_language_options_for_service(TranslationService.GOOGLE_CLOUD)
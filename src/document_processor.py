@@ -4,6 +4,7 @@ Supports PDF, DOCX, TXT files with fallback options.
 """
 
 import io
+import logging
 import tempfile
 import os
 from typing import Optional, Dict, Any, List
@@ -14,12 +15,15 @@ from docx import Document
 import chardet
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 try:
     from docling.document_converter import DocumentConverter
     DOCLING_AVAILABLE = True
 except ImportError:
     DOCLING_AVAILABLE = False
-    print("DocLing not available. Using fallback PDF extraction methods.")
+    logger.info("DocLing not available. Using fallback PDF extraction methods.")
 
 class DocumentProcessor:
     """Class for processing and extracting text from various document formats."""
@@ -33,7 +37,7 @@ class DocumentProcessor:
             try:
                 self.converter = DocumentConverter()
             except Exception as e:
-                print(f"Could not initialize DocLing: {e}")
+                logger.warning("Could not initialize DocLing: %s", e)
                 self.converter = None
     
     def process_file(self, uploaded_file, target_language: str = 'en', translation_service=None) -> Dict[str, Any]:
@@ -90,16 +94,14 @@ class DocumentProcessor:
                 try:
                     # Detect language of extracted text
                     detected_language = translation_service.detect_language(extracted_text)
-                    print(f"🔍 Detected document language: {translation_service.get_language_name(detected_language) if detected_language else 'Unknown'}")
+                    logger.debug("Detected document language: %s", detected_language or "unknown")
                     
                     # Check if translation is needed
                     if detected_language and detected_language != target_language:
                         translation_needed = True
-                        print(f"🌍 Translating document from {translation_service.get_language_name(detected_language)} to {translation_service.get_language_name(target_language)}")
+                        logger.debug("Translating document from %s to %s", detected_language, target_language)
                         
-                        print("Translating document from ", detected_language, "to", target_language)
                         # Translate the text
-                        print("Translating document...")
                         translation_result = translation_service.translate_text(
                             extracted_text, 
                             target_language, 
@@ -107,20 +109,19 @@ class DocumentProcessor:
                             uploaded_file.name
                         )
                         
-                        # print("Translation result", translation_result)
                         if translation_result["success"]:
                             translated_text = translation_result["translated_text"]
-                            print(f"✅ Document translated successfully using {translation_result.get('method', 'unknown method')}")
+                            logger.debug("Document translated using %s", translation_result.get("method", "unknown method"))
                         else:
                             translation_success = False
                             translation_error = translation_result.get("error", "Translation failed")
-                            print(f"⚠️ Translation failed: {translation_error}. Using original text.")
+                            logger.warning("Translation failed: %s. Using original text.", translation_error)
                             translated_text = extracted_text
                     else:
-                        print(f"ℹ️ No translation needed - document is already in {translation_service.get_language_name(target_language)}")
+                        logger.debug("No translation needed - document is already in %s", target_language)
                         
                 except Exception as e:
-                    print(f"⚠️ Language processing failed: {e}. Using original text.")
+                    logger.warning("Language processing failed: %s. Using original text.", e)
                     translation_error = str(e)
                     translation_success = False
             
@@ -139,7 +140,7 @@ class DocumentProcessor:
                 "file_type": file_extension,
                 "word_count": word_count,
                 "char_count": char_count,
-                "pages": self._estimate_pages(final_text),
+                "pages": self._estimate_pages(final_text, word_count),
                 "detected_language": detected_language,
                 "target_language": target_language,
                 "translation_needed": translation_needed,
@@ -152,13 +153,9 @@ class DocumentProcessor:
     
     def _extract_pdf_text(self, file_content: bytes, filename: str) -> str:
         """Extract text from PDF using multiple methods."""
-        
-        print("Docling available: ", DOCLING_AVAILABLE)
-        
-        
         # Try DocLing first if available
         if self.converter and DOCLING_AVAILABLE:
-            print("using docling")
+            logger.debug("Extracting %s with DocLing", filename)
             try:
                 # Save content to temporary file for DocLing
                 with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
@@ -167,19 +164,17 @@ class DocumentProcessor:
                 
                 # Convert with DocLing
                 result = self.converter.convert(tmp_file_path)
-                print("Docling conversion successful")
+                logger.debug("DocLing conversion successful")
                 
                 # Clean up temporary file
                 os.unlink(tmp_file_path)
                 
                 # Extract text from DocLing result
                 if hasattr(result, 'document') and hasattr(result.document, 'export_to_text'):
-                    exported_text = result.document.export_to_text()
-                    # print("Docling exported_text: ", exported_text)
-                    return exported_text
+                    return result.document.export_to_text()
                 
             except Exception as e:
-                print(f"DocLing extraction failed: {e}. Trying fallback methods.")
+                logger.warning("DocLing extraction failed: %s. Trying fallback methods.", e)
         
         # Fallback to pdfplumber
         try:
@@ -194,7 +189,7 @@ class DocumentProcessor:
                     if text_parts:
                         return '\n\n'.join(text_parts)
         except Exception as e:
-            print(f"pdfplumber extraction failed: {e}. Trying PyPDF2.")
+            logger.warning("pdfplumber extraction failed: %s. Trying PyPDF2.", e)
         
         # Fallback to PyPDF2
         try:
@@ -263,10 +258,10 @@ class DocumentProcessor:
             
             raise Exception(f"Failed to decode text file: {e}")
     
-    def _estimate_pages(self, text: str) -> int:
+    def _estimate_pages(self, text: str, word_count: Optional[int] = None) -> int:
         """Estimate number of pages based on text length."""
-        # Rough estimation: 250 words per page
-        words = len(text.split())
+        # Rough estimation: 250 words per page; reuse the caller's word count when available
+        words = word_count if word_count is not None else len(text.split())
         return max(1, words // 250)
     
     def chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
@@ -0,0 +1,89 @@
+"""
+Persistent embedding cache for the RAG system.
+Stores sentence embeddings in SQLite keyed by a hash of the model, backend and text,
+so re-indexed documents and repeated questions skip the embedding model.
+Vectors are stored as float16 to halve the cache size and returned as float32.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_MAX_PARAMS = 500
+
+# On-disk vector precision; normalized MiniLM embeddings lose nothing meaningful in fp16
+_STORAGE_DTYPE = np.float16
+
+class EmbeddingCache:
+    """SQLite-backed cache of embedding vectors keyed by content hash."""
+
+    def __init__(self, model_name: str, backend: str, path: str = "cache/embeddings.sqlite"):
+        self.model_name = model_name
+        self.backend = backend
+        # Backends (e.g. 'onnx-int8', 'torch-fp16') produce slightly different vectors,
+        # so each gets its own key space
+        self._model_prefix = f"{model_name}|{backend}\0".encode("utf-8")
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_fp16 (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def make_key(self, text: str) -> bytes:
+        """
+        Build the cache key for a text.
+
+        Args:
+            text: Text that will be embedded
+
+        Returns:
+            SHA-256 digest of the model name, backend and text
+        """
+        return hashlib.sha256(self._model_prefix + text.encode("utf-8")).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            keys: Cache keys from make_key
+
+        Returns:
+            Dict of key to float32 embedding for the keys that were found
+        """
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique_keys), _SQLITE_MAX_PARAMS):
+                batch = unique_keys[start:start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings_fp16 WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=_STORAGE_DTYPE).astype(np.float32)
+        return found
+
+    def set_many(self, items: Iterable[Tuple[bytes, np.ndarray]]) -> None:
+        """
+        Store embeddings in one transaction.
+
+        Args:
+            items: (key, embedding) pairs
+        """
+        rows = [(key, np.asarray(vector, dtype=_STORAGE_DTYPE).tobytes()) for key, vector in items]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings_fp16 (key, vector) VALUES (?, ?)", rows
+                )
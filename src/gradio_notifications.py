@@ -0,0 +1,20 @@
+"""
+Gradio toast notifications for the multilingual document chatbot.
+Shared by the services so they can notify the UI and still run outside a Gradio request.
+"""
+
+import gradio as gr
+
+def safe_gradio_notification(notification_type: str, message: str):
+    """Safely call Gradio notifications, only if in proper context."""
+    try:
+        if notification_type == "info":
+            gr.Info(message)
+        elif notification_type == "warning":
+            gr.Warning(message)
+        elif notification_type == "error":
+            gr.Error(message)
+    except Exception:
+        # If Gradio context is not available, just skip the notification
+        # The log message is still recorded
+        pass
@@ -0,0 +1,209 @@
+"""
+Language detection for the multilingual document chatbot.
+Uses the compiled fastText language-identification model when available, then
+Google's CLD3 neural detector, and falls back to langdetect otherwise.
+"""
+
+import bisect
+import functools
+import logging
+import threading
+from collections import Counter
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional
+from src.config import Config
+
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except ImportError:
+    FASTTEXT_AVAILABLE = False
+
+try:
+    import gcld3
+    GCLD3_AVAILABLE = True
+except ImportError:
+    GCLD3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Only the first characters of a text are used for detection
+DETECTION_SAMPLE_CHARS = 1000
+
+# Letters inspected when guessing the writing system of a text
+SCRIPT_SAMPLE_CHARS = 256
+
+# Unicode blocks of the scripts used by the supported languages, sorted by first code point
+_SCRIPT_BLOCKS = (
+    (0x0041, 0x024F, "Latin"),
+    (0x0400, 0x04FF, "Cyrillic"),
+    (0x0600, 0x06FF, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A00, 0x0A7F, "Gurmukhi"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0C80, 0x0CFF, "Kannada"),
+    (0x0D00, 0x0D7F, "Malayalam"),
+    (0x3040, 0x30FF, "Kana"),
+    (0x4E00, 0x9FFF, "Han"),
+    (0xAC00, 0xD7AF, "Hangul"),
+)
+_SCRIPT_BLOCK_STARTS = tuple(block[0] for block in _SCRIPT_BLOCKS)
+
+_LATIN: FrozenSet[str] = frozenset({"Latin"})
+
+# Scripts a language is normally written in
+LANGUAGE_SCRIPTS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    'en': _LATIN, 'es': _LATIN, 'fr': _LATIN, 'de': _LATIN, 'it': _LATIN, 'pt': _LATIN,
+    'ru': frozenset({"Cyrillic"}),
+    'ja': frozenset({"Kana", "Han"}),
+    'ko': frozenset({"Hangul", "Han"}),
+    'zh': frozenset({"Han"}),
+    'ar': frozenset({"Arabic"}),
+    'ur': frozenset({"Arabic"}),
+    'hi': frozenset({"Devanagari"}),
+    'mr': frozenset({"Devanagari"}),
+    'bn': frozenset({"Bengali"}),
+    'ta': frozenset({"Tamil"}),
+    'te': frozenset({"Telugu"}),
+    'gu': frozenset({"Gujarati"}),
+    'kn': frozenset({"Kannada"}),
+    'ml': frozenset({"Malayalam"}),
+    'pa': frozenset({"Gurmukhi"}),
+})
+
+_lid_model = None
+_lid_model_failed = False
+_lid_model_lock = threading.Lock()
+
+_cld3_detector = None
+
+# langdetect loads its language profiles on import, so it is only imported when needed
+_LANGDETECT = None
+
+def _get_lid_model():
+    """Load the fastText language-identification model once per process."""
+    global _lid_model, _lid_model_failed
+
+    if _lid_model is not None or _lid_model_failed or not FASTTEXT_AVAILABLE:
+        return _lid_model
+
+    with _lid_model_lock:
+        if _lid_model is None and not _lid_model_failed:
+            try:
+                _lid_model = fasttext.load_model(Config.LANGUAGE_ID_MODEL_PATH)
+                logger.info("Loaded fastText language model from %s", Config.LANGUAGE_ID_MODEL_PATH)
+            except Exception as e:
+                _lid_model_failed = True
+                logger.warning("fastText language model unavailable (%s). Falling back to langdetect.", e)
+    return _lid_model
+
+def _get_cld3_detector():
+    """Create the CLD3 detector once per process."""
+    global _cld3_detector
+
+    if _cld3_detector is None and GCLD3_AVAILABLE:
+        _cld3_detector = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=DETECTION_SAMPLE_CHARS)
+    return _cld3_detector
+
+def _get_langdetect():
+    """Import langdetect and load its language profiles once, on first use."""
+    global _LANGDETECT
+
+    if _LANGDETECT is None:
+        with _lid_model_lock:
+            if _LANGDETECT is None:
+                import langdetect
+                from langdetect import DetectorFactory
+                from langdetect.detector_factory import init_factory
+
+                # Deterministic results (langdetect samples randomly otherwise)
+                DetectorFactory.seed = 0
+                # Build the shared profile factory here rather than racing to do it inside detect()
+                init_factory()
+                _LANGDETECT = langdetect
+    return _LANGDETECT
+
+def detect_script(text: str) -> Optional[str]:
+    """
+    Guess the dominant writing system of a text from the Unicode blocks of its first letters.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Script name (e.g., 'Latin', 'Devanagari', 'Han') or None if no known script was found
+    """
+    counts = Counter()
+    letters = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        code_point = ord(char)
+        index = bisect.bisect_right(_SCRIPT_BLOCK_STARTS, code_point) - 1
+        if index >= 0 and code_point <= _SCRIPT_BLOCKS[index][1]:
+            counts[_SCRIPT_BLOCKS[index][2]] += 1
+        letters += 1
+        if letters >= SCRIPT_SAMPLE_CHARS:
+            break
+    if not counts:
+        return None
+    return counts.most_common(1)[0][0]
+
+def is_script_mismatch(text: str, target_language: str) -> bool:
+    """
+    Check whether a text is clearly not written in the target language's script.
+
+    Args:
+        text: Text to analyze
+        target_language: Global language code
+
+    Returns:
+        True if the text's script cannot be the target language's, False if undecided
+    """
+    target_scripts = LANGUAGE_SCRIPTS.get(target_language)
+    if target_scripts is None:
+        return False
+    script = detect_script(text)
+    return script is not None and script not in target_scripts
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Detect the language of the given text.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Global language code (e.g., 'en', 'es', 'hi')
+
+    Raises:
+        Exception: If no detector could classify the text
+    """
+    return _detect_sample(text[:DETECTION_SAMPLE_CHARS])
+
+@functools.lru_cache(maxsize=2048)
+def _detect_sample(sample: str) -> Optional[str]:
+    """Detect the language of a text sample; results are memoized by sample."""
+    model = _get_lid_model()
+    if model is not None:
+        try:
+            # fastText predicts one line at a time and labels look like '__label__en'
+            labels, _ = model.predict(sample.replace('\n', ' '), k=1)
+            if labels:
+                return labels[0].replace('__label__', '', 1)
+        except Exception as e:
+            logger.warning("fastText language detection failed: %s. Using fallback detector.", e)
+
+    detector = _get_cld3_detector()
+    if detector is not None:
+        try:
+            result = detector.FindLanguage(text=sample)
+            if result.is_reliable:
+                return result.language
+        except Exception as e:
+            logger.warning("CLD3 language detection failed: %s. Using langdetect.", e)
+
+    return _get_langdetect().detect(sample)
@@ -3,207 +3,225 @@ Language mapping system for the Multilingual Document Chatbot.
 Maps between global language codes, Google Cloud codes, and NLLB codes.
 """
 
-from typing import Dict, List, Tuple, Optional
+import functools
+from types import MappingProxyType
+from typing import List, Tuple, Optional, Mapping
 from enum import Enum
 
 class TranslationService(Enum):
     GOOGLE_CLOUD = "google_cloud"
     NLLB = "nllb"
 
-class LanguageMapping:
-    """
-    Global language mapping system that handles different language codes 
-    for different translation services.
+# NLLB supported languages (from user specification)
+NLLB_SUPPORTED: Mapping[str, str] = MappingProxyType({
+    'en': 'eng_Latn',    # English
+    'hi': 'hin_Deva',    # Hindi
+    'es': 'spa_Latn',    # Spanish
+    'fr': 'fra_Latn',    # French
+    'ta': 'tam_Taml',    # Tamil
+    'ar': 'arb_Arab',    # Arabic
+})
+
+# Google Cloud codes are the same as global codes
+GOOGLE_CODES = frozenset({
+    'en',                # English
+    'es',                # Spanish
+    'fr',                # French
+    'de',                # German
+    'it',                # Italian
+    'pt',                # Portuguese
+    'ru',                # Russian
+    'ja',                # Japanese
+    'ko',                # Korean
+    'zh',                # Chinese (Simplified)
+    'ar',                # Arabic
+    'hi',                # Hindi
+    'ur',                # Urdu
+    'bn',                # Bengali
+    'ta',                # Tamil
+    'te',                # Telugu
+    'mr',                # Marathi
+    'gu',                # Gujarati
+    'kn',                # Kannada
+    'ml',                # Malayalam
+    'pa',                # Punjabi
+})
+
+# Lookup tables derived once at import time
+NLLB_TO_GLOBAL: Mapping[str, str] = MappingProxyType(
+    {nllb_code: global_code for global_code, nllb_code in NLLB_SUPPORTED.items()}
+)
+NLLB_GLOBAL_CODES = frozenset(NLLB_SUPPORTED)
+
+# Language names for display
+LANGUAGE_NAMES: Mapping[str, str] = MappingProxyType({
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh': 'Chinese (Simplified)',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'ur': 'Urdu',
+    'bn': 'Bengali',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'kn': 'Kannada',
+    'ml': 'Malayalam',
+    'pa': 'Punjabi',
+})
+
+SERVICE_DISPLAY_NAMES: Mapping[TranslationService, str] = MappingProxyType({
+    TranslationService.GOOGLE_CLOUD: "Google Cloud Translate",
+    TranslationService.NLLB: "NLLB (Open Source)"
+})
+
+@functools.lru_cache(maxsize=4)
+def get_supported_languages(service: TranslationService) -> Mapping[str, str]:
     """
+    Get supported languages for a specific service.
     
-    # NLLB supported languages (from user specification)
-    NLLB_SUPPORTED = {
-        'en': 'eng_Latn',    # English
-        'hi': 'hin_Deva',    # Hindi
-        'es': 'spa_Latn',    # Spanish
-        'fr': 'fra_Latn',    # French
-        'ta': 'tam_Taml',    # Tamil
-        'ar': 'arb_Arab',    # Arabic
-    }
-    
-    # Google Cloud to Global mapping (inverse will be computed)
-    GOOGLE_TO_GLOBAL = {
-        'en': 'en',          # English
-        'es': 'es',          # Spanish
-        'fr': 'fr',          # French
-        'de': 'de',          # German
-        'it': 'it',          # Italian
-        'pt': 'pt',          # Portuguese
-        'ru': 'ru',          # Russian
-        'ja': 'ja',          # Japanese
-        'ko': 'ko',          # Korean
-        'zh': 'zh',          # Chinese (Simplified)
-        'ar': 'ar',          # Arabic
-        'hi': 'hi',          # Hindi
-        'ur': 'ur',          # Urdu
-        'bn': 'bn',          # Bengali
-        'ta': 'ta',          # Tamil
-        'te': 'te',          # Telugu
-        'mr': 'mr',          # Marathi
-        'gu': 'gu',          # Gujarati
-        'kn': 'kn',          # Kannada
-        'ml': 'ml',          # Malayalam
-        'pa': 'pa',          # Punjabi
-    }
-    
-    # Language names for display
-    LANGUAGE_NAMES = {
-        'en': 'English',
-        'es': 'Spanish',
-        'fr': 'French',
-        'de': 'German',
-        'it': 'Italian',
-        'pt': 'Portuguese',
-        'ru': 'Russian',
-        'ja': 'Japanese',
-        'ko': 'Korean',
-        'zh': 'Chinese (Simplified)',
-        'ar': 'Arabic',
-        'hi': 'Hindi',
-        'ur': 'Urdu',
-        'bn': 'Bengali',
-        'ta': 'Tamil',
-        'te': 'Telugu',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'kn': 'Kannada',
-        'ml': 'Malayalam',
-        'pa': 'Punjabi',
-    }
-
-    @classmethod
-    def get_supported_languages(cls, service: TranslationService) -> Dict[str, str]:
-        """
-        Get supported languages for a specific service.
-        
-        Args:
-            service: Translation service enum
-            
-        Returns:
-            Dict mapping global language codes to language names
-        """
-        if service == TranslationService.GOOGLE_CLOUD:
-            return {code: cls.LANGUAGE_NAMES[code] for code in cls.GOOGLE_TO_GLOBAL.values()}
-        elif service == TranslationService.NLLB:
-            return {code: cls.LANGUAGE_NAMES[code] for code in cls.NLLB_SUPPORTED.keys()}
-        else:
-            return {}
-
-    @classmethod
-    def get_service_code(cls, global_code: str, service: TranslationService) -> Optional[str]:
-        """
-        Convert global language code to service-specific code.
+    Args:
+        service: Translation service enum
         
-        Args:
-            global_code: Global language code (e.g., 'en', 'fr')
-            service: Translation service enum
-            
-        Returns:
-            Service-specific language code or None if not supported
-        """
-        if service == TranslationService.GOOGLE_CLOUD:
-            # For Google Cloud, the codes are the same as global codes
-            return global_code if global_code in cls.GOOGLE_TO_GLOBAL.values() else None
-        elif service == TranslationService.NLLB:
-            return cls.NLLB_SUPPORTED.get(global_code)
-        else:
-            return None
-
-    @classmethod
-    def get_global_code(cls, service_code: str, service: TranslationService) -> Optional[str]:
-        """
-        Convert service-specific code to global language code.
+    Returns:
+        Read-only mapping of global language codes to language names
+    """
+    if service == TranslationService.GOOGLE_CLOUD:
+        # Iterate LANGUAGE_NAMES so the display order stays stable
+        languages = {code: name for code, name in LANGUAGE_NAMES.items() if code in GOOGLE_CODES}
+    elif service == TranslationService.NLLB:
+        languages = {code: LANGUAGE_NAMES[code] for code in NLLB_SUPPORTED.keys()}
+    else:
+        languages = {}
+    return MappingProxyType(languages)
+
+@functools.lru_cache(maxsize=128)
+def get_service_code(global_code: str, service: TranslationService) -> Optional[str]:
+    """
+    Convert global language code to service-specific code.
+    
+    Args:
+        global_code: Global language code (e.g., 'en', 'fr')
+        service: Translation service enum
         
-        Args:
-            service_code: Service-specific language code
-            service: Translation service enum
-            
-        Returns:
-            Global language code or None if not found
-        """
-        if service == TranslationService.GOOGLE_CLOUD:
-            # For Google Cloud, the codes are the same as global codes
-            return service_code if service_code in cls.GOOGLE_TO_GLOBAL.values() else None
-        elif service == TranslationService.NLLB:
-            # Reverse lookup for NLLB
-            for global_code, nllb_code in cls.NLLB_SUPPORTED.items():
-                if nllb_code == service_code:
-                    return global_code
-            return None
-        else:
-            return None
-
-    @classmethod
-    def is_language_supported(cls, global_code: str, service: TranslationService) -> bool:
-        """
-        Check if a language is supported by a specific service.
+    Returns:
+        Service-specific language code or None if not supported
+    """
+    if service == TranslationService.GOOGLE_CLOUD:
+        # For Google Cloud, the codes are the same as global codes
+        return global_code if global_code in GOOGLE_CODES else None
+    elif service == TranslationService.NLLB:
+        return NLLB_SUPPORTED.get(global_code)
+    else:
+        return None
+
+def get_global_code(service_code: str, service: TranslationService) -> Optional[str]:
+    """
+    Convert service-specific code to global language code.
+    
+    Args:
+        service_code: Service-specific language code
+        service: Translation service enum
         
-        Args:
-            global_code: Global language code
-            service: Translation service enum
-            
-        Returns:
-            True if language is supported, False otherwise
-        """
-        return cls.get_service_code(global_code, service) is not None
-
-    @classmethod
-    def get_language_name(cls, global_code: str) -> str:
-        """
-        Get the display name for a language code.
+    Returns:
+        Global language code or None if not found
+    """
+    if service == TranslationService.GOOGLE_CLOUD:
+        # For Google Cloud, the codes are the same as global codes
+        return service_code if service_code in GOOGLE_CODES else None
+    elif service == TranslationService.NLLB:
+        return NLLB_TO_GLOBAL.get(service_code)
+    else:
+        return None
+
+@functools.lru_cache(maxsize=128)
+def is_language_supported(global_code: str, service: TranslationService) -> bool:
+    """
+    Check if a language is supported by a specific service.
+    
+    Args:
+        global_code: Global language code
+        service: Translation service enum
         
-        Args:
-            global_code: Global language code
-            
-        Returns:
-            Language display name or the code itself if not found
-        """
-        return cls.LANGUAGE_NAMES.get(global_code, global_code.upper())
-
-    @classmethod
-    def get_language_options_for_service(cls, service: TranslationService) -> List[Tuple[str, str]]:
-        """
-        Get language options for UI selection for a specific service.
+    Returns:
+        True if language is supported, False otherwise
+    """
+    return get_service_code(global_code, service) is not None
+
+@functools.lru_cache(maxsize=128)
+def get_language_name(global_code: str) -> str:
+    """
+    Get the display name for a language code.
+    
+    Args:
+        global_code: Global language code
         
-        Args:
-            service: Translation service enum
-            
-        Returns:
-            List of (global_code, display_name) tuples
-        """
-        supported_languages = cls.get_supported_languages(service)
-        return [(code, name) for code, name in supported_languages.items()]
-
-    @classmethod
-    def get_common_languages(cls) -> List[str]:
-        """
-        Get languages supported by both services.
+    Returns:
+        Language display name or the code itself if not found
+    """
+    return LANGUAGE_NAMES.get(global_code, global_code.upper())
+
+@functools.lru_cache(maxsize=4)
+def get_language_options_for_service(service: TranslationService) -> Tuple[Tuple[str, str], ...]:
+    """
+    Get language options for UI selection for a specific service.
+    
+    Args:
+        service: Translation service enum
         
-        Returns:
-            List of global language codes supported by both services
-        """
-        google_codes = set(cls.GOOGLE_TO_GLOBAL.values())
-        nllb_codes = set(cls.NLLB_SUPPORTED.keys())
-        return list(google_codes.intersection(nllb_codes))
-
-    @classmethod
-    def get_service_display_name(cls, service: TranslationService) -> str:
-        """
-        Get display name for translation service.
+    Returns:
+        Tuple of (global_code, display_name) tuples
+    """
+    return tuple(get_supported_languages(service).items())
+
+def get_common_languages() -> List[str]:
+    """
+    Get languages supported by both services.
+    
+    Returns:
+        List of global language codes supported by both services
+    """
+    return list(GOOGLE_CODES & NLLB_GLOBAL_CODES)
+
+def get_service_display_name(service: TranslationService) -> str:
+    """
+    Get display name for translation service.
+    
+    Args:
+        service: Translation service enum
         
-        Args:
-            service: Translation service enum
-            
-        Returns:
-            Display name for the service
-        """
-        service_names = {
-            TranslationService.GOOGLE_CLOUD: "Google Cloud Translate",
-            TranslationService.NLLB: "NLLB (Open Source)"
-        }
-        return service_names.get(service, str(service)) 
\ No newline at end of file
+    Returns:
+        Display name for the service
+    """
+    return SERVICE_DISPLAY_NAMES.get(service, str(service))
+
+class LanguageMapping:
+    """
+    Global language mapping system that handles different language codes 
+    for different translation services.
+    
+    Thin facade over the module-level functions, kept for existing callers.
+    """
+    
+    NLLB_SUPPORTED = NLLB_SUPPORTED
+    GOOGLE_CODES = GOOGLE_CODES
+    NLLB_TO_GLOBAL = NLLB_TO_GLOBAL
+    NLLB_GLOBAL_CODES = NLLB_GLOBAL_CODES
+    LANGUAGE_NAMES = LANGUAGE_NAMES
+    
+    get_supported_languages = staticmethod(get_supported_languages)
+    get_service_code = staticmethod(get_service_code)
+    get_global_code = staticmethod(get_global_code)
+    is_language_supported = staticmethod(is_language_supported)
+    get_language_name = staticmethod(get_language_name)
+    get_language_options_for_service = staticmethod(get_language_options_for_service)
+    get_common_languages = staticmethod(get_common_languages)
+    get_service_display_name = staticmethod(get_service_display_name)
@@ -3,25 +3,179 @@ NLLB Translation Service for open-source translation using Facebook's NLLB model
 Handles model caching, loading, and translation with support for multiple languages.
 """
 
-import os
-import json
+import re
 import hashlib
+import queue
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping, Iterator, Tuple
 import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
-import langdetect
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
-from src.language_mapping import LanguageMapping, TranslationService
+try:
+    import ctranslate2
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+from src import language_mapping
+from src.language_mapping import TranslationService
+from src import language_detection
+from src.translation_cache import get_translation_cache
+
+# Sentence boundary: whitespace following sentence-ending punctuation (captured)
+_SENT_SPLIT = re.compile(r'(?<=[.!?])(\s+)')
+
+# Number of tokenized chunks kept in memory across translation requests
+_TOKEN_CACHE_SIZE = 4096
+
+# Marks the end of the background tokenization queue
+_END_OF_BATCHES = object()
+
+# Texts longer than this are chunked by the compiled splitter when numba is available
+_NUMBA_SPLIT_MIN_CHARS = 64_000
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _is_space(c):
+        """Match the characters that str.isspace() (and regex \\s) treat as whitespace."""
+        return ((9 <= c <= 13) or (28 <= c <= 32) or c == 0x85 or c == 0xA0 or c == 0x1680
+                or (0x2000 <= c <= 0x200A) or c == 0x2028 or c == 0x2029 or c == 0x202F
+                or c == 0x205F or c == 0x3000)
+
+    @njit(cache=True)
+    def _chunk_offsets(codepoints, max_length):
+        """
+        Compute sentence-packed chunk offsets over an array of code points.
+
+        Mirrors the regex splitter: a sentence ends at '.', '!' or '?' followed by
+        whitespace, and sentences are packed greedily up to max_length.
+
+        Returns:
+            int64 array of (chunk_start, chunk_end, separator_end) rows
+        """
+        n = codepoints.shape[0]
+        offsets = np.empty((64, 3), dtype=np.int64)
+        count = 0
+        chunk_start = 0
+        current_length = 0
+        has_current = False
+        pending_start = 0
+        pending_end = 0
+        sentence_start = 0
+
+        while sentence_start < n:
+            # Find the end of the sentence and of the whitespace run after it
+            sentence_end = n
+            separator_end = n
+            j = sentence_start
+            while j < n:
+                c = codepoints[j]
+                if (c == 46 or c == 33 or c == 63) and j + 1 < n and _is_space(codepoints[j + 1]):
+                    sentence_end = j + 1
+                    k = j + 1
+                    while k < n and _is_space(codepoints[k]):
+                        k += 1
+                    separator_end = k
+                    break
+                j += 1
+
+            sentence_length = sentence_end - sentence_start
+            if has_current and current_length + sentence_length > max_length:
+                if count == offsets.shape[0]:
+                    grown = np.empty((count * 2, 3), dtype=np.int64)
+                    grown[:count] = offsets
+                    offsets = grown
+                offsets[count, 0] = chunk_start
+                offsets[count, 1] = pending_start
+                offsets[count, 2] = pending_end
+                count += 1
+                chunk_start = sentence_start
+                current_length = 0
+            elif has_current:
+                current_length += pending_end - pending_start
+
+            current_length += sentence_length
+            has_current = True
+            pending_start = sentence_end
+            pending_end = separator_end
+            sentence_start = separator_end
+
+        if has_current:
+            if count == offsets.shape[0]:
+                grown = np.empty((count + 1, 3), dtype=np.int64)
+                grown[:count] = offsets
+                offsets = grown
+            offsets[count, 0] = chunk_start
+            offsets[count, 1] = pending_start
+            offsets[count, 2] = pending_end
+            count += 1
+
+        return offsets[:count]
+
+# Let SDPA dispatch to FlashAttention kernels where the GPU supports them
+if torch.cuda.is_available():
+    torch.backends.cuda.enable_flash_sdp(True)
 
 class NLLBTranslationService:
     """Open-source translation service using Facebook's NLLB model."""
     
-    def __init__(self, model_name: str = "facebook/nllb-200-distilled-600M"):
+    # One shared instance (and loaded model) per model name
+    _INSTANCES: Dict[str, "NLLBTranslationService"] = {}
+    _LOCK = threading.Lock()
+    
+    def __new__(cls, model_name: str = "facebook/nllb-200-distilled-600M", *args, **kwargs):
+        with cls._LOCK:
+            instance = cls._INSTANCES.get(model_name)
+            if instance is None:
+                instance = super().__new__(cls)
+                instance._initialized = False
+                cls._INSTANCES[model_name] = instance
+            return instance
+    
+    def __init__(self, model_name: str = "facebook/nllb-200-distilled-600M", batch_size: int = 16,
+                 quantization: str = "none", ct2_model_dir: Optional[str] = None,
+                 compile_model: bool = False):
+        with self._LOCK:
+            self._init_locked(model_name, batch_size, quantization, ct2_model_dir, compile_model)
+    
+    def _init_locked(self, model_name: str, batch_size: int, quantization: str,
+                     ct2_model_dir: Optional[str], compile_model: bool) -> None:
+        """Initialize a new instance; the caller holds the class lock."""
+        # Re-constructing an existing service reuses its model and settings
+        if self._initialized:
+            requested = (batch_size, quantization, Path(ct2_model_dir) if ct2_model_dir else None, compile_model)
+            current = (self.batch_size, self.quantization, self.ct2_model_dir, self.compile_model)
+            if requested != current:
+                print(f"⚠️ NLLB service for {model_name} already exists; ignoring new settings "
+                      f"(batch_size, quantization, ct2_model_dir, compile_model) {requested}, keeping {current}")
+            return
+        self._initialized = True
+        
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.quantization = quantization
+        self.compile_model = compile_model
+        self.ct2_model_dir = Path(ct2_model_dir) if ct2_model_dir else None
         self.model = None
         self.tokenizer = None
         self.translator = None
+        self._tok_stream = None
+        self.device = None
+        self._bos_id_cache: Dict[str, int] = {}
+        self._token_cache: "OrderedDict[tuple, List[int]]" = OrderedDict()
+        # The tokenizer's src_lang is shared state; hold this while setting it and tokenizing,
+        # and while touching the token cache (the prefetch thread encodes concurrently)
+        self._tokenize_lock = threading.Lock()
+        self._load_lock = threading.Lock()
         self.cache_dir = Path("cache")
         self.models_dir = Path("models")
         
@@ -29,6 +183,9 @@ class NLLBTranslationService:
         self.cache_dir.mkdir(exist_ok=True)
         self.models_dir.mkdir(exist_ok=True)
         
+        # Shared SQLite store with the Google service (keys carry the service name)
+        self.translation_cache = get_translation_cache(str(self.cache_dir / "translations.sqlite"))
+        
         print(f"🔍 Initializing NLLB Translation Service with model: {model_name}")
         
     def _load_model(self) -> bool:
@@ -38,9 +195,17 @@ class NLLBTranslationService:
         Returns:
             True if model loaded successfully, False otherwise
         """
-        if self.model is not None and self.tokenizer is not None:
+        if self.tokenizer is not None and (self.model is not None or self.translator is not None):
             return True
-            
+        
+        with self._load_lock:
+            # Another thread may have finished loading while we waited
+            if self.tokenizer is not None and (self.model is not None or self.translator is not None):
+                return True
+            return self._load_model_locked()
+    
+    def _load_model_locked(self) -> bool:
+        """Load the tokenizer and model; the caller holds the load lock."""
         try:
             print(f"📥 Loading NLLB model: {self.model_name}")
             print(f"💾 Models will be cached in: {self.models_dir.absolute()}")
@@ -51,22 +216,105 @@ class NLLBTranslationService:
                 cache_dir=str(self.models_dir)
             )
             
+            # Prefer the CTranslate2 engine when a converted model is available
+            if self._load_ct2_translator():
+                return True
+            
             # Load model with caching and optimization
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(
-                self.model_name,
-                cache_dir=str(self.models_dir),
-                torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
-                device_map="auto" if torch.cuda.is_available() else None
-            )
+            use_cuda = torch.cuda.is_available()
+            quantize_int8 = self.quantization == "int8"
+            model_kwargs = {
+                "cache_dir": str(self.models_dir),
+                "torch_dtype": torch.float16 if use_cuda else torch.float32,
+                "device_map": "auto" if use_cuda else None
+            }
+            if quantize_int8 and use_cuda:
+                try:
+                    import bitsandbytes  # noqa: F401
+                    from transformers import BitsAndBytesConfig
+                    model_kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+                except ImportError:
+                    print("⚠️ bitsandbytes not installed, loading NLLB without 8-bit quantization")
+            try:
+                # Fused scaled-dot-product attention instead of eager attention
+                self.model = AutoModelForSeq2SeqLM.from_pretrained(
+                    self.model_name,
+                    attn_implementation="sdpa",
+                    **model_kwargs
+                )
+            except (ValueError, ImportError) as e:
+                print(f"⚠️ SDPA attention not available ({e}), using default attention")
+                self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name, **model_kwargs)
+            
+            if quantize_int8 and not use_cuda:
+                # Dynamic int8 quantization of the Linear layers for CPU inference
+                self.model = torch.ao.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                print("🗜️ NLLB linear layers quantized to int8")
+            
+            # Resolve the parameter device once instead of on every request
+            self.device = next(self.model.parameters()).device
+            
+            if self.compile_model and hasattr(torch, "compile"):
+                self._compile_model()
+            
+            if use_cuda:
+                # Side stream for host-to-device copies, overlapped with generate
+                self._tok_stream = torch.cuda.Stream()
             
             print(f"✅ NLLB model loaded successfully")
-            print(f"🎯 Model device: {next(self.model.parameters()).device}")
+            print(f"🎯 Model device: {self.device}")
             return True
             
         except Exception as e:
             print(f"❌ Failed to load NLLB model: {e}")
             return False
     
+    def _load_ct2_translator(self) -> bool:
+        """
+        Load a CTranslate2-converted NLLB model if one is available.
+        
+        The model is produced once with:
+            ct2-transformers-converter --model facebook/nllb-200-distilled-600M \
+                --output_dir models/nllb-ct2 --quantization int8
+        
+        Returns:
+            True if the CTranslate2 translator is ready, False to use transformers
+        """
+        if not CTRANSLATE2_AVAILABLE or not self.ct2_model_dir or not self.ct2_model_dir.is_dir():
+            return False
+        
+        try:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.translator = ctranslate2.Translator(
+                str(self.ct2_model_dir),
+                device=device,
+                compute_type="int8_float16" if device == "cuda" else "int8"
+            )
+            print(f"✅ NLLB CTranslate2 model loaded from {self.ct2_model_dir} ({device})")
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to load CTranslate2 model, falling back to transformers: {e}")
+            self.translator = None
+            return False
+    
+    def _compile_model(self) -> None:
+        """Compile the model forward pass with TorchInductor and warm it up."""
+        original_forward = self.model.forward
+        try:
+            self.model.forward = torch.compile(original_forward, mode="reduce-overhead", fullgraph=False)
+            
+            # Warm up so the first user request doesn't pay the compilation latency
+            inputs = self.tokenizer.pad({"input_ids": self._encode_chunks(["Hello."], "eng_Latn")}, return_tensors="pt")
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.inference_mode():
+                self.model.generate(**inputs, max_new_tokens=1)
+            print("⚡ NLLB model compiled with torch.compile")
+        except Exception as e:
+            self.model.forward = original_forward
+            print(f"⚠️ torch.compile failed, using eager model: {e}")
+    
     def _get_device(self) -> str:
         """Get the device to use for inference."""
         if torch.cuda.is_available():
@@ -87,9 +335,8 @@ class NLLBTranslationService:
             Global language code or None if detection fails
         """
         try:
-            # Use langdetect library (same as Google service for consistency)
-            detected = langdetect.detect(text[:1000])  # Use first 1000 chars for detection
-            return detected
+            # fastText / CLD3 when available, langdetect otherwise
+            return language_detection.detect_language(text)
         except Exception as e:
             print(f"⚠️ Language detection failed: {e}")
             return None
@@ -111,13 +358,15 @@ class NLLBTranslationService:
             return {"success": False, "error": "Empty text provided"}
         
         # Check if target language is supported
-        if not LanguageMapping.is_language_supported(target_language, TranslationService.NLLB):
+        if not language_mapping.is_language_supported(target_language, TranslationService.NLLB):
             return {"success": False, "error": f"Target language '{target_language}' not supported by NLLB"}
         
         # Check cache first if filename is provided
         cache_key = None
         if filename:
-            cache_key = self._generate_cache_key(filename, text, target_language, source_language, "NLLB")
+            # Encode once; the hash path works on the UTF-8 bytes directly
+            text_bytes = text.encode('utf-8')
+            cache_key = self._generate_cache_key(filename, text_bytes, target_language, source_language, "NLLB")
             cached_result = self._load_translation_cache(cache_key)
             if cached_result:
                 cached_result["method"] = cached_result.get("method", "nllb") + "_cached"
@@ -150,7 +399,7 @@ class NLLBTranslationService:
             return result
         
         # Check if source language is supported
-        if not LanguageMapping.is_language_supported(source_language, TranslationService.NLLB):
+        if not language_mapping.is_language_supported(source_language, TranslationService.NLLB):
             return {"success": False, "error": f"Source language '{source_language}' not supported by NLLB"}
         
         # Load model if not already loaded
@@ -191,8 +440,8 @@ class NLLBTranslationService:
         """
         try:
             # Convert global codes to NLLB codes
-            nllb_source = LanguageMapping.get_service_code(source_lang, TranslationService.NLLB)
-            nllb_target = LanguageMapping.get_service_code(target_lang, TranslationService.NLLB)
+            nllb_source = language_mapping.get_service_code(source_lang, TranslationService.NLLB)
+            nllb_target = language_mapping.get_service_code(target_lang, TranslationService.NLLB)
             
             if not nllb_source or not nllb_target:
                 return {
@@ -203,38 +452,20 @@ class NLLBTranslationService:
             print(f"🔄 Translating with NLLB: {source_lang} ({nllb_source}) -> {target_lang} ({nllb_target})")
             
             # Split text into chunks if it's too long
-            chunks = self._split_text_for_translation(text)
-            translated_chunks = []
+            segments = self._split_text_for_translation(text)
+            chunks = [chunk for chunk, _ in segments]
             
-            for chunk in chunks:
-                # Set source language in tokenizer
-                self.tokenizer.src_lang = nllb_source
-                
-                # Tokenize input
-                inputs = self.tokenizer(chunk, return_tensors="pt", padding=True, truncation=True, max_length=512)
-                
-                # Move inputs to the same device as model
-                device = next(self.model.parameters()).device
-                inputs = {k: v.to(device) for k, v in inputs.items()}
-                
-                # Generate translation
-                with torch.no_grad():
-                    translated_tokens = self.model.generate(
-                        **inputs,
-                        forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(nllb_target),
-                        max_length=512,
-                        num_beams=4,
-                        no_repeat_ngram_size=2,
-                        do_sample=False,
-                        early_stopping=True
-                    )
-                
-                # Decode translation
-                translated_text = self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)[0]
-                translated_chunks.append(translated_text)
+            # Source language is constant for the whole document
+            if self.translator is not None:
+                translated_chunks = self._generate_with_ct2(chunks, nllb_source, nllb_target)
+            else:
+                translated_chunks = self._generate_with_transformers(chunks, nllb_source, nllb_target)
             
-            # Join all chunks
-            final_translation = ' '.join(translated_chunks)
+            # Join all chunks with the separators from the original text
+            final_translation = ''.join(
+                translated + separator
+                for translated, (_, separator) in zip(translated_chunks, segments)
+            )
             
             return {
                 "success": True,
@@ -251,7 +482,169 @@ class NLLBTranslationService:
                 "error": f"NLLB model translation failed: {e}"
             }
     
-    def _split_text_for_translation(self, text: str, max_length: int = 400) -> List[str]:
+    def _generate_with_transformers(self, chunks: List[str], nllb_source: str, nllb_target: str) -> List[str]:
+        """Translate chunks with the transformers model in padded batches."""
+        translated_chunks = []
+        bos_id = self._get_bos_token_id(nllb_target)
+        device = self.device
+        
+        # On CUDA, tokenize the next batch in the background while the GPU generates
+        if self._tok_stream is not None and device.type == "cuda":
+            batches = self._prefetch_batches(chunks, nllb_source)
+        else:
+            batches = self._prepare_batches(chunks, nllb_source)
+        
+        # One generate call per batch
+        for inputs in batches:
+            # Move the batch to the same device as the model
+            if self._tok_stream is not None and device.type == "cuda":
+                with torch.cuda.stream(self._tok_stream):
+                    inputs = {k: v.to(device, non_blocking=True) for k, v in inputs.items()}
+                current_stream = torch.cuda.current_stream()
+                current_stream.wait_stream(self._tok_stream)
+                for tensor in inputs.values():
+                    tensor.record_stream(current_stream)
+            else:
+                inputs = {k: v.to(device, non_blocking=True) for k, v in inputs.items()}
+            
+            # Short inputs decode greedily; output length is bounded by the input length
+            in_len = inputs['input_ids'].shape[1]
+            generation_kwargs = {
+                "forced_bos_token_id": bos_id,
+                "max_length": min(512, int(in_len * 1.8) + 8),
+                "num_beams": 1 if in_len < 32 else 4,
+                "no_repeat_ngram_size": 2,
+                "do_sample": False
+            }
+            if generation_kwargs["num_beams"] > 1:
+                generation_kwargs["early_stopping"] = True
+            
+            # Generate translations
+            with torch.inference_mode():
+                translated_tokens = self.model.generate(**inputs, **generation_kwargs)
+            
+            # Decode translations (aligned with the batch order)
+            translated_chunks.extend(self.tokenizer.batch_decode(translated_tokens, skip_special_tokens=True))
+        
+        return translated_chunks
+    
+    def _prepare_batches(self, chunks: List[str], src_lang: str, pin_memory: bool = False) -> Iterator[Dict[str, torch.Tensor]]:
+        """Yield padded input tensors for each batch of chunks."""
+        for batch_start in range(0, len(chunks), self.batch_size):
+            batch = chunks[batch_start:batch_start + self.batch_size]
+            inputs = self.tokenizer.pad({"input_ids": self._encode_chunks(batch, src_lang)}, return_tensors="pt")
+            if pin_memory:
+                # Page-locked host memory allows asynchronous copies to the GPU
+                inputs = {k: v.pin_memory() for k, v in inputs.items()}
+            yield inputs
+    
+    def _prefetch_batches(self, chunks: List[str], src_lang: str) -> Iterator[Dict[str, torch.Tensor]]:
+        """
+        Tokenize batches on a background thread, keeping up to two batches ready.
+        
+        Args:
+            chunks: Text chunks to tokenize
+            src_lang: NLLB source language code
+            
+        Yields:
+            Padded input tensors in pinned host memory, in batch order
+        """
+        batch_queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def producer():
+            try:
+                for inputs in self._prepare_batches(chunks, src_lang, pin_memory=True):
+                    if stop.is_set():
+                        return
+                    batch_queue.put(inputs)
+                batch_queue.put(_END_OF_BATCHES)
+            except Exception as e:
+                batch_queue.put(e)
+        
+        worker = threading.Thread(target=producer, name="nllb-tokenizer", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = batch_queue.get()
+                if item is _END_OF_BATCHES:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Unblock the producer if it is waiting on a full queue
+            while not batch_queue.empty():
+                batch_queue.get_nowait()
+    
+    def _generate_with_ct2(self, chunks: List[str], nllb_source: str, nllb_target: str) -> List[str]:
+        """Translate chunks with the CTranslate2 engine (native beam search)."""
+        # CTranslate2 works on token strings; the HF tokenizer handles pre/post-processing
+        source_tokens = [self.tokenizer.convert_ids_to_tokens(ids) for ids in self._encode_chunks(chunks, nllb_source)]
+        results = self.translator.translate_batch(
+            source_tokens,
+            target_prefix=[[nllb_target]] * len(source_tokens),
+            beam_size=4,
+            max_batch_size=self.batch_size,
+            max_decoding_length=512,
+            no_repeat_ngram_size=2
+        )
+        
+        translated_chunks = []
+        for result in results:
+            # Drop the forced target-language prefix token
+            target_tokens = result.hypotheses[0][1:]
+            translated_chunks.append(
+                self.tokenizer.decode(self.tokenizer.convert_tokens_to_ids(target_tokens), skip_special_tokens=True)
+            )
+        return translated_chunks
+    
+    def _encode_chunks(self, chunks: List[str], src_lang: str) -> List[List[int]]:
+        """
+        Tokenize chunks for a source language, reusing cached token ids.
+        
+        Args:
+            chunks: Text chunks to encode
+            src_lang: NLLB source language code
+            
+        Returns:
+            List of token id lists, aligned with the input chunks
+        """
+        encoded: List[Optional[List[int]]] = []
+        missing = []
+        
+        with self._tokenize_lock:
+            for chunk in chunks:
+                key = (src_lang, chunk)
+                ids = self._token_cache.get(key)
+                if ids is not None:
+                    self._token_cache.move_to_end(key)
+                else:
+                    missing.append(len(encoded))
+                encoded.append(ids)
+            
+            if missing:
+                # Tokenize all misses in one call; src_lang selects the language prefix token
+                self.tokenizer.src_lang = src_lang
+                new_ids = self.tokenizer([chunks[i] for i in missing], truncation=True, max_length=512)["input_ids"]
+                for i, ids in zip(missing, new_ids):
+                    encoded[i] = ids
+                    self._token_cache[(src_lang, chunks[i])] = ids
+                
+                while len(self._token_cache) > _TOKEN_CACHE_SIZE:
+                    self._token_cache.popitem(last=False)
+        
+        return encoded
+    
+    def _get_bos_token_id(self, nllb_code: str) -> int:
+        """Get the forced BOS token id for an NLLB language code, caching vocab lookups."""
+        bos_id = self._bos_id_cache.get(nllb_code)
+        if bos_id is None:
+            bos_id = self._bos_id_cache[nllb_code] = self.tokenizer.convert_tokens_to_ids(nllb_code)
+        return bos_id
+    
+    def _split_text_for_translation(self, text: str, max_length: int = 400) -> List[Tuple[str, str]]:
         """
         Split text into chunks suitable for NLLB translation.
         
@@ -260,42 +653,63 @@ class NLLBTranslationService:
             max_length: Maximum length per chunk
             
         Returns:
-            List of text chunks
+            List of (chunk, trailing_separator) tuples; the separators are the
+            original whitespace between chunks so the translation can be rejoined
         """
         if len(text) <= max_length:
-            return [text]
+            return [(text, '')]
         
-        chunks = []
-        current_chunk = ""
+        if NUMBA_AVAILABLE and len(text) > _NUMBA_SPLIT_MIN_CHARS:
+            # UTF-32 gives one array element per code point, so offsets index the str directly
+            codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+            return [
+                (text[start:end], text[end:separator_end])
+                for start, end, separator_end in _chunk_offsets(codepoints, max_length).tolist()
+            ]
         
-        # Split by sentences first
-        sentences = text.replace('.', '.|').replace('!', '!|').replace('?', '?|').split('|')
+        # Single regex pass; the capturing group keeps the separators at odd indices
+        parts = _SENT_SPLIT.split(text)
+        sentences = []
+        for i in range(0, len(parts), 2):
+            sentence = parts[i]
+            separator = parts[i + 1] if i + 1 < len(parts) else ''
+            if sentence:
+                sentences.append((sentence, separator))
+            elif sentences:
+                sentences[-1] = (sentences[-1][0], sentences[-1][1] + separator)
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-            
+        chunks = []
+        current_parts = []
+        current_length = 0
+        pending_separator = ''
+        
+        for sentence, separator in sentences:
             # If adding this sentence would exceed limit, save current chunk
-            if len(current_chunk) + len(sentence) > max_length and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                current_chunk += (" " + sentence if current_chunk else sentence)
+            if current_parts and current_length + len(sentence) > max_length:
+                chunks.append((''.join(current_parts), pending_separator))
+                current_parts = []
+                current_length = 0
+            elif current_parts:
+                current_parts.append(pending_separator)
+                current_length += len(pending_separator)
+            
+            current_parts.append(sentence)
+            current_length += len(sentence)
+            pending_separator = separator
         
         # Add the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        if current_parts:
+            chunks.append((''.join(current_parts), pending_separator))
         
         return chunks
     
-    def _generate_cache_key(self, filename: str, text: str, target_lang: str, source_lang: str, service: str) -> str:
+    def _generate_cache_key(self, filename: str, text_bytes: bytes, target_lang: str, source_lang: str, service: str) -> str:
         """
         Generate cache key for translation.
         
         Args:
             filename: Original filename
-            text: Text to translate
+            text_bytes: UTF-8 encoded text to translate
             target_lang: Target language
             source_lang: Source language
             service: Service name (NLLB)
@@ -303,8 +717,9 @@ class NLLBTranslationService:
         Returns:
             Cache key string
         """
-        # Create a hash of the text content for uniqueness
-        text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+        # Create a hash of the text content for uniqueness (128-bit BLAKE2b, as wide as the
+        # Google Cloud keys sharing the store, so collisions are not a practical concern)
+        text_hash = hashlib.blake2b(text_bytes, digest_size=16).hexdigest()
         
         # Clean filename for cache key
         clean_filename = Path(filename).stem
@@ -317,42 +732,49 @@ class NLLBTranslationService:
     def _save_translation_cache(self, cache_key: str, translation_result: Dict[str, Any]) -> None:
         """Save translation result to cache."""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(translation_result, f, ensure_ascii=False, indent=2)
+            self.translation_cache.set(cache_key, translation_result)
         except Exception as e:
             print(f"⚠️ Failed to save NLLB translation cache: {e}")
     
     def _load_translation_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Load translation result from cache."""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self.translation_cache.get(cache_key)
         except Exception as e:
             print(f"⚠️ Failed to load NLLB translation cache: {e}")
         return None
     
-    def get_supported_languages(self) -> Dict[str, str]:
+    def get_supported_languages(self) -> Mapping[str, str]:
         """Get list of supported languages for NLLB."""
-        return LanguageMapping.get_supported_languages(TranslationService.NLLB)
+        return language_mapping.get_supported_languages(TranslationService.NLLB)
     
     def is_translation_needed(self, text: str, target_language: str) -> bool:
         """Check if translation is needed based on detected language."""
+        # A text in another script always needs translation; skip the statistical detector
+        if language_detection.is_script_mismatch(text, target_language):
+            return True
         detected_lang = self.detect_language(text)
         return detected_lang != target_language if detected_lang else True
     
     def get_language_name(self, language_code: str) -> str:
         """Get full language name from language code."""
-        return LanguageMapping.get_language_name(language_code)
+        return language_mapping.get_language_name(language_code)
     
     def validate_language_code(self, language_code: str) -> bool:
         """Validate if language code is supported by NLLB."""
-        return LanguageMapping.is_language_supported(language_code, TranslationService.NLLB)
+        return language_mapping.is_language_supported(language_code, TranslationService.NLLB)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
+        if self.translator is not None:
+            return {
+                "loaded": True,
+                "model_name": self.model_name,
+                "backend": "ctranslate2",
+                "device": self.translator.device,
+                "cache_dir": str(self.ct2_model_dir.absolute())
+            }
+        
         if self.model is None:
             return {"loaded": False}
         
@@ -0,0 +1,109 @@
+"""
+ONNX Runtime backend for the sentence embedding model.
+Runs an exported (optionally int8-quantized) all-MiniLM-L6-v2 on CPU with fused kernels,
+exposing the subset of the SentenceTransformer.encode API used by the RAG system.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+from transformers import AutoTokenizer
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Preferred model files inside the export directory, quantized first
+_MODEL_FILES = ("model_quantized.onnx", "model.onnx")
+
+class ONNXSentenceEmbedder:
+    """Mean-pooled sentence embeddings computed with ONNX Runtime."""
+
+    def __init__(self, model_dir: str, max_length: int = 256, num_threads: int = 0):
+        model_path = self.find_model_file(model_dir)
+        if model_path is None:
+            raise FileNotFoundError(f"No ONNX model found in {model_dir}")
+
+        self.max_length = max_length
+        # The quantized export is listed first in _MODEL_FILES
+        self.precision = "int8" if model_path.name == _MODEL_FILES[0] else "fp32"
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # 0 lets ONNX Runtime use one thread per physical core
+        session_options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    @staticmethod
+    def find_model_file(model_dir: str) -> Optional[Path]:
+        """
+        Locate the ONNX model inside an export directory.
+
+        Args:
+            model_dir: Directory produced by `optimum-cli export onnx` / `optimum-cli onnxruntime quantize`
+
+        Returns:
+            Path to the model file or None if ONNX Runtime or the model is unavailable
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            return None
+        for filename in _MODEL_FILES:
+            path = Path(model_dir) / filename
+            if path.is_file():
+                return path
+        return None
+
+    def encode(self, texts: List[str], batch_size: int = 64, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = True, show_progress_bar: bool = False) -> np.ndarray:
+        """
+        Embed texts in batches.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per ONNX Runtime call
+            convert_to_numpy: Accepted for SentenceTransformer compatibility (always numpy)
+            normalize_embeddings: L2-normalize the embeddings
+            show_progress_bar: Accepted for SentenceTransformer compatibility (ignored)
+
+        Returns:
+            float32 array of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Smart batching: group texts of similar length so batches carry little padding
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+
+        batches = []
+        for start in range(0, len(sorted_texts), batch_size):
+            batches.append(self._encode_batch(sorted_texts[start:start + batch_size]))
+        sorted_embeddings = np.vstack(batches)
+
+        # Restore the caller's order
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings.astype(np.float32, copy=False)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Run one batch through the model and mean-pool over the attention mask."""
+        inputs = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+        )
+        feed = {name: value.astype(np.int64) for name, value in inputs.items() if name in self._input_names}
+        token_embeddings = self.session.run(None, feed)[0]
+
+        mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.maximum(mask.sum(axis=1), 1e-9)
+        return summed / counts
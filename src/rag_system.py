@@ -3,31 +3,99 @@ RAG (Retrieval-Augmented Generation) system for the multilingual document chatbo
 Handles document indexing, retrieval, and answer generation using OpenAI and vector databases.
 """
 
-import gradio as gr
+import asyncio
+import logging
+import httpx
 import openai
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
+import os
+import re
 import uuid
 import tiktoken
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from src.config import Config
+from src.gradio_notifications import safe_gradio_notification
 from src.translation_service import TranslationService
+from src.embedding_cache import EmbeddingCache
+from src.onnx_embedder import ONNXSentenceEmbedder
 
-def safe_gradio_notification(notification_type: str, message: str):
-    """Safely call Gradio notifications, only if in proper context."""
-    try:
-        if notification_type == "info":
-            gr.Info(message)
-        elif notification_type == "warning":
-            gr.Warning(message)
-        elif notification_type == "error":
-            gr.Error(message)
-    except Exception:
-        # If Gradio context is not available, just skip the notification
-        # The print statement will still work
-        pass
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Chunks embedded and added to ChromaDB per batch while indexing
+_INDEX_BATCH_SIZE = 256
+
+# A word is a run of non-whitespace, matching str.split() counts
+_WORD_RE = re.compile(r'\S+')
+
+# OpenAI errors worth retrying: rate limits and transient server/network failures
+_RETRYABLE_OPENAI_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError
+)
+
+_exponential_backoff = wait_exponential_jitter(initial=1, max=30)
+
+# Pooled HTTP/2 connections: reuse TLS sessions and multiplex concurrent calls
+_OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+def _wait_retry_after(retry_state) -> float:
+    """Wait for the server's Retry-After hint when present, otherwise back off exponentially."""
+    exception = retry_state.outcome.exception()
+    response = getattr(exception, "response", None)
+    if response is not None:
+        try:
+            return float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    return _exponential_backoff(retry_state)
+
+def _mmr_select(query_embedding: np.ndarray, candidate_embeddings: np.ndarray,
+                top_k: int, lambda_mult: float) -> List[int]:
+    """
+    Select candidates by maximal marginal relevance.
+    
+    Args:
+        query_embedding: L2-normalized query vector, shape (dim,)
+        candidate_embeddings: L2-normalized candidate vectors, shape (n, dim)
+        top_k: Number of candidates to select
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+        
+    Returns:
+        Indices of the selected candidates, in selection order
+    """
+    n = candidate_embeddings.shape[0]
+    if n == 0:
+        return []
+    
+    # All similarities up front: one matrix-vector and one matrix-matrix product
+    query_similarity = candidate_embeddings @ query_embedding
+    pairwise_similarity = candidate_embeddings @ candidate_embeddings.T
+    
+    first = int(np.argmax(query_similarity))
+    selected = [first]
+    is_selected = np.zeros(n, dtype=bool)
+    is_selected[first] = True
+    max_similarity_to_selected = pairwise_similarity[:, first].copy()
+    
+    for _ in range(1, min(top_k, n)):
+        scores = lambda_mult * query_similarity - (1 - lambda_mult) * max_similarity_to_selected
+        scores[is_selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        is_selected[best] = True
+        np.maximum(max_similarity_to_selected, pairwise_similarity[:, best], out=max_similarity_to_selected)
+    
+    return selected
 
 class RAGSystem:
     """RAG system for document question answering with multilingual support."""
@@ -35,41 +103,85 @@ class RAGSystem:
     def __init__(self):
         self.openai_client = None
         self.embedding_model = None
+        self.embedding_backend = None
         self.chroma_client = None
         self.collection = None
+        self.embedding_cache = None
         self.translation_service = TranslationService()
         
+        # Prompts only depend on the language; build them once
+        self._system_prompts = {
+            code: self._build_system_prompt(code) for code in Config.SUPPORTED_LANGUAGES
+        }
+        self._prompt_templates = {
+            code: self._build_prompt_template(code) for code in Config.SUPPORTED_LANGUAGES
+        }
+        
+        # Load the BPE ranks once instead of on every count_tokens call
+        try:
+            self._tokenizer = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        except Exception as e:
+            logger.warning("tiktoken encoder unavailable, token counts will be estimated: %s", e)
+            self._tokenizer = None
+        
         # Initialize OpenAI client
         if Config.OPENAI_API_KEY:
             try:
                 from openai import OpenAI
-                self.openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
+                self.openai_client = OpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    http_client=httpx.Client(http2=True, limits=_OPENAI_HTTP_LIMITS, timeout=30)
+                )
             except Exception as e:
                 error_msg = f"Failed to initialize OpenAI client: {e}"
-                print(f"Error: {error_msg}")
+                logger.error(error_msg)
                 safe_gradio_notification("error", error_msg)
         
         # Initialize embedding model
         try:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            device = self._get_embed_device()
+            if device == "cpu":
+                self.embedding_model = self._load_onnx_embedder()
+            if self.embedding_model is None:
+                if device == "cpu":
+                    # ONNX Runtime sizes its own pool; only the PyTorch path needs pinning
+                    self._configure_cpu_threads()
+                self.embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=device)
+                if device == "cuda":
+                    # Half precision on GPU; encode() output is cast back to float32
+                    self.embedding_model.half()
+                self.embedding_backend = "torch-fp16" if device == "cuda" else "torch-fp32"
+                logger.info("Embedding model device: %s", device)
+            else:
+                self.embedding_backend = f"onnx-{self.embedding_model.precision}"
         except Exception as e:
             error_msg = f"Failed to load embedding model: {e}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             safe_gradio_notification("error", error_msg)
         
+        # Initialize the persistent embedding cache, keyed by the backend that computes the vectors
+        if self.embedding_backend is not None:
+            try:
+                self.embedding_cache = EmbeddingCache(EMBEDDING_MODEL_NAME, self.embedding_backend)
+            except Exception as e:
+                logger.warning("Embedding cache unavailable, embeddings will not be cached: %s", e)
+                self.embedding_cache = None
+        
         # Initialize ChromaDB
         try:
-            self.chroma_client = chromadb.Client(Settings(
-                persist_directory="./chroma_db",
-                allow_reset=True
-            ))
+            # Persistent client so the index is reloaded from disk instead of re-embedded on restart
+            self.chroma_client = chromadb.PersistentClient(
+                path="./chroma_db",
+                settings=Settings(anonymized_telemetry=False, allow_reset=True)
+            )
             self.collection = self.chroma_client.get_or_create_collection(
                 name="document_chunks",
-                metadata={"hnsw:space": "cosine"}
+                metadata=self._collection_metadata()
             )
+            logger.info("ChromaDB collection loaded with %d chunks", self.collection.count())
         except Exception as e:
             warning_msg = f"Failed to initialize ChromaDB: {e}"
-            print(f"Warning: {warning_msg}")
+            logger.warning(warning_msg)
             safe_gradio_notification("warning", warning_msg)
             self.chroma_client = None
             self.collection = None
@@ -85,76 +197,88 @@ class RAGSystem:
         Returns:
             Indexing result with chunk count and status
         """
+        # Generate unique document ID
+        doc_id = str(uuid.uuid4())
+        
         try:
-            # Generate unique document ID
-            doc_id = str(uuid.uuid4())
-            
-            # Chunk the document
-            chunks = self._chunk_text(document_text)
-            
-            if not chunks:
-                return {"success": False, "error": "No chunks generated from document"}
-            
-            # Generate embeddings for chunks
-            embeddings = []
-            chunk_metadata = []
-            chunk_ids = []
-            
-            for i, chunk in enumerate(chunks):
+            filename = document_info.get("filename", "unknown")
+            file_type = document_info.get("file_type", "unknown")
+            chunks_count = 0
+            embeddings_count = 0
+            
+            # Chunk, embed and store in a streaming pipeline so only one batch is in memory
+            for batch_chunks in self._iter_chunk_batches(document_text, _INDEX_BATCH_SIZE):
+                batch_start = chunks_count
+                chunks_count += len(batch_chunks)
+                
+                # Generate embeddings for the batch, reusing cached ones
                 try:
-                    # Generate embedding
-                    embedding = self.embedding_model.encode(chunk).tolist()
-                    embeddings.append(embedding)
-                    
-                    # Create chunk metadata
-                    metadata = {
+                    embeddings = self._encode_cached(batch_chunks)
+                except Exception as e:
+                    logger.error("Failed to generate embeddings for %s: %s", filename, e)
+                    self._remove_partial_index(doc_id)
+                    return {"success": False, "error": f"Failed to generate embeddings: {e}"}
+                embeddings_count += len(embeddings)
+                
+                # Create chunk metadata and IDs
+                chunk_lengths = list(map(len, batch_chunks))
+                word_counts = [sum(1 for _ in _WORD_RE.finditer(chunk)) for chunk in batch_chunks]
+                chunk_metadata = [
+                    {
                         "document_id": doc_id,
                         "chunk_index": i,
-                        "filename": document_info.get("filename", "unknown"),
-                        "file_type": document_info.get("file_type", "unknown"),
-                        "chunk_length": len(chunk),
-                        "word_count": len(chunk.split())
+                        "filename": filename,
+                        "file_type": file_type,
+                        "chunk_length": chunk_length,
+                        "word_count": word_count
                     }
-                    chunk_metadata.append(metadata)
-                    
-                    # Generate chunk ID
-                    chunk_id = f"{doc_id}_chunk_{i}"
-                    chunk_ids.append(chunk_id)
-                    
-                except Exception as e:
-                    warning_msg = f"Failed to process chunk {i}: {e}"
-                    print(f"Warning: {warning_msg}")
-                    safe_gradio_notification("warning", warning_msg)
-                    continue
+                    for i, (chunk_length, word_count) in enumerate(zip(chunk_lengths, word_counts), start=batch_start)
+                ]
+                chunk_ids = [f"{doc_id}_chunk_{i}" for i in range(batch_start, batch_start + len(batch_chunks))]
+                
+                # Store in ChromaDB
+                if self.collection:
+                    try:
+                        self.collection.add(
+                            embeddings=embeddings,
+                            documents=batch_chunks,
+                            metadatas=chunk_metadata,
+                            ids=chunk_ids
+                        )
+                    except Exception as e:
+                        error_msg = f"Failed to store in ChromaDB: {e}"
+                        logger.error(error_msg)
+                        safe_gradio_notification("error", error_msg)
+                        self._remove_partial_index(doc_id)
+                        return {"success": False, "error": error_msg}
+            
+            if chunks_count == 0:
+                return {"success": False, "error": "No chunks generated from document"}
             
-            if not embeddings:
+            if embeddings_count == 0:
                 return {"success": False, "error": "No embeddings generated"}
             
-            # Store in ChromaDB
-            if self.collection:
-                try:
-                    self.collection.add(
-                        embeddings=embeddings,
-                        documents=chunks,
-                        metadatas=chunk_metadata,
-                        ids=chunk_ids
-                    )
-                except Exception as e:
-                    warning_msg = f"Failed to store in ChromaDB: {e}"
-                    print(f"Warning: {warning_msg}")
-                    safe_gradio_notification("warning", warning_msg)
-            
             return {
                 "success": True,
                 "document_id": doc_id,
-                "chunks_count": len(chunks),
-                "embeddings_count": len(embeddings),
+                "chunks_count": chunks_count,
+                "embeddings_count": embeddings_count,
                 "storage_method": "chromadb" if self.collection else "memory"
             }
             
         except Exception as e:
+            self._remove_partial_index(doc_id)
             return {"success": False, "error": f"Document indexing failed: {e}"}
     
+    def _remove_partial_index(self, doc_id: str) -> None:
+        """Delete the chunks already stored for a document whose indexing failed."""
+        if not self.collection:
+            return
+        try:
+            self.collection.delete(where={"document_id": doc_id})
+        except Exception as e:
+            logger.warning("Failed to remove partial index for document %s: %s", doc_id, e)
+    
     def retrieve_relevant_chunks(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Retrieve relevant document chunks for a given query.
@@ -166,39 +290,81 @@ class RAGSystem:
         Returns:
             List of relevant chunks with metadata and similarity scores
         """
+        return self.retrieve_relevant_chunks_batch([query], top_k)[0]
+    
+    def retrieve_relevant_chunks_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant document chunks for several queries with one index lookup.
+        
+        When RETRIEVAL_MMR is enabled, RETRIEVAL_MMR_FETCH_FACTOR * top_k candidates are
+        fetched and reranked with maximal marginal relevance so near-duplicate chunks
+        don't crowd out other relevant context.
+        
+        Args:
+            queries: User questions (or sub-queries of one question)
+            top_k: Number of top chunks to retrieve per query
+            
+        Returns:
+            One list of relevant chunks per query, in query order
+        """
         try:
-            if not self.collection or not self.embedding_model:
-                return []
+            if not queries or not self.collection or not self.embedding_model:
+                return [[] for _ in queries]
+            
+            # Generate all query embeddings in one batch
+            query_embeddings = self._encode_cached(queries)
             
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            use_mmr = Config.RETRIEVAL_MMR
+            include = ["documents", "metadatas", "distances"]
+            if use_mmr:
+                include.append("embeddings")
             
             # Search in ChromaDB
             results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k,
-                include=["documents", "metadatas", "distances"]
+                query_embeddings=query_embeddings,
+                n_results=top_k * Config.RETRIEVAL_MMR_FETCH_FACTOR if use_mmr else top_k,
+                include=include
             )
             
             # Format results
-            relevant_chunks = []
-            if results["documents"] and results["documents"][0]:
-                for i in range(len(results["documents"][0])):
-                    chunk_data = {
-                        "text": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                        "similarity_score": 1 - results["distances"][0][i],  # Convert distance to similarity
+            all_chunks = []
+            for q in range(len(queries)):
+                documents = results["documents"][q] if results["documents"] else None
+                if not documents:
+                    all_chunks.append([])
+                    continue
+                
+                metadatas = results["metadatas"][q]
+                # IP distance is 1 - dot product; convert all distances to similarities at once
+                similarities = 1.0 - np.asarray(results["distances"][q], dtype=np.float32)
+                
+                if use_mmr:
+                    order = _mmr_select(
+                        query_embeddings[q],
+                        np.asarray(results["embeddings"][q], dtype=np.float32),
+                        top_k,
+                        Config.RETRIEVAL_MMR_LAMBDA
+                    )
+                else:
+                    order = range(len(documents))
+                
+                all_chunks.append([
+                    {
+                        "text": documents[j],
+                        "metadata": metadatas[j],
+                        "similarity_score": float(similarities[j]),
                         "chunk_index": i
                     }
-                    relevant_chunks.append(chunk_data)
+                    for i, j in enumerate(order)
+                ])
             
-            return relevant_chunks
+            return all_chunks
             
         except Exception as e:
             warning_msg = f"Retrieval failed: {e}"
-            print(f"Warning: {warning_msg}")
+            logger.warning(warning_msg)
             safe_gradio_notification("warning", warning_msg)
-            return []
+            return [[] for _ in queries]
     
     def generate_answer(self, query: str, context_chunks: List[Dict[str, Any]], 
                        target_language: str = 'en') -> Dict[str, Any]:
@@ -217,46 +383,125 @@ class RAGSystem:
             if not self.openai_client:
                 return {"success": False, "error": "OpenAI client not available"}
             
-            # Prepare context from chunks
-            context_text = self._prepare_context(context_chunks)
-            
-            # Create prompt
-            prompt = self._create_prompt(query, context_text, target_language)
-            
             # Call OpenAI API
             response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt(target_language)
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1000,
-                temperature=0.3
+                **self._chat_request(query, context_chunks, target_language)
             )
+            return self._format_answer(response, context_chunks, target_language)
             
-            answer = response.choices[0].message.content.strip()
+        except Exception as e:
+            return {"success": False, "error": f"Answer generation failed: {e}"}
+    
+    async def agenerate_answer(self, query: str, context_chunks: List[Dict[str, Any]],
+                               target_language: str = 'en') -> Dict[str, Any]:
+        """
+        Generate an answer asynchronously.
+        
+        Rate-limited or transient failures are retried with exponential backoff.
+        Use agenerate_answers to overlap several questions.
+        
+        Args:
+            query: User question
+            context_chunks: Retrieved relevant chunks
+            target_language: Language for the response
             
-            # Calculate token usage
-            tokens_used = response.usage.total_tokens
+        Returns:
+            Generated answer with metadata
+        """
+        results = await self.agenerate_answers([(query, context_chunks, target_language)])
+        return results[0]
+    
+    async def agenerate_answers(self, requests: List[Tuple[str, List[Dict[str, Any]], str]]) -> List[Dict[str, Any]]:
+        """
+        Generate answers for several questions concurrently.
+        
+        Concurrency is bounded by OPENAI_MAX_CONCURRENCY. The async HTTP client and
+        the semaphore are bound to the running event loop, so both are created per
+        call and the client is closed afterwards.
+        
+        Args:
+            requests: (query, context_chunks, target_language) tuples
             
-            return {
-                "success": True,
-                "answer": answer,
-                "context_chunks_used": len(context_chunks),
-                "tokens_used": tokens_used,
-                "model_used": "gpt-3.5-turbo",
-                "target_language": target_language
-            }
+        Returns:
+            Answer results in request order
+        """
+        if not self.openai_client:
+            return [{"success": False, "error": "OpenAI client not available"} for _ in requests]
+        
+        from openai import AsyncOpenAI
+        semaphore = asyncio.Semaphore(Config.OPENAI_MAX_CONCURRENCY)
+        async with AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(http2=True, limits=_OPENAI_HTTP_LIMITS, timeout=30)
+        ) as client:
+            return await asyncio.gather(*(
+                self._agenerate_answer(client, semaphore, query, context_chunks, target_language)
+                for query, context_chunks, target_language in requests
+            ))
+    
+    async def _agenerate_answer(self, client, semaphore: asyncio.Semaphore, query: str,
+                                context_chunks: List[Dict[str, Any]], target_language: str) -> Dict[str, Any]:
+        """Generate one answer with a loop-bound client, turning failures into an error result."""
+        try:
+            async with semaphore:
+                response = await self._acreate_completion(
+                    client, self._chat_request(query, context_chunks, target_language)
+                )
+            return self._format_answer(response, context_chunks, target_language)
             
         except Exception as e:
             return {"success": False, "error": f"Answer generation failed: {e}"}
     
+    @retry(
+        retry=retry_if_exception_type(_RETRYABLE_OPENAI_ERRORS),
+        wait=_wait_retry_after,
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _acreate_completion(self, client, request: Dict[str, Any]):
+        """Call the async chat completions API (retried on rate limits and transient errors)."""
+        return await client.chat.completions.create(**request)
+    
+    def _chat_request(self, query: str, context_chunks: List[Dict[str, Any]], target_language: str) -> Dict[str, Any]:
+        """Build the chat completion request for a question and its context."""
+        # Prepare context from chunks
+        context_text = self._prepare_context(context_chunks)
+        
+        # Create prompt
+        prompt = self._create_prompt(query, context_text, target_language)
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._get_system_prompt(target_language)
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            "max_tokens": 1000,
+            "temperature": 0.3
+        }
+    
+    def _format_answer(self, response, context_chunks: List[Dict[str, Any]], target_language: str) -> Dict[str, Any]:
+        """Convert a chat completion response into an answer result."""
+        answer = response.choices[0].message.content.strip()
+        
+        # Calculate token usage
+        tokens_used = response.usage.total_tokens
+        
+        return {
+            "success": True,
+            "answer": answer,
+            "context_chunks_used": len(context_chunks),
+            "tokens_used": tokens_used,
+            "model_used": "gpt-3.5-turbo",
+            "target_language": target_language
+        }
+    
     def ask_question(self, query: str, target_language: str = 'en') -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve relevant chunks and generate answer.
@@ -311,34 +556,126 @@ class RAGSystem:
         except Exception as e:
             return {"success": False, "error": f"Question answering failed: {e}"}
     
+    def _encode_cached(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, only running the model on texts missing from the cache.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            float32 array of shape (len(texts), dim) with L2-normalized rows
+        """
+        if self.embedding_cache is None:
+            return self._encode(texts)
+        
+        keys = [self.embedding_cache.make_key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        
+        if missing:
+            new_embeddings = self._encode([texts[i] for i in missing])
+            # Round through fp16 so cache hits and misses return identical vectors
+            new_embeddings = new_embeddings.astype(np.float16).astype(np.float32)
+            new_items = [(keys[i], embedding) for i, embedding in zip(missing, new_embeddings)]
+            cached.update(new_items)
+            try:
+                self.embedding_cache.set_many(new_items)
+            except Exception as e:
+                logger.warning("Failed to write embedding cache: %s", e)
+        
+        return np.vstack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the embedding model on a batch of texts."""
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=Config.EMBED_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype(np.float32, copy=False)
+    
+    def _load_onnx_embedder(self) -> Optional[ONNXSentenceEmbedder]:
+        """Load the ONNX Runtime export of the embedding model for CPU inference, if present."""
+        if ONNXSentenceEmbedder.find_model_file(Config.EMBED_ONNX_MODEL_DIR) is None:
+            return None
+        try:
+            embedder = ONNXSentenceEmbedder(Config.EMBED_ONNX_MODEL_DIR, num_threads=Config.EMBED_NUM_THREADS)
+            logger.info("Embedding model loaded with ONNX Runtime from %s", Config.EMBED_ONNX_MODEL_DIR)
+            return embedder
+        except Exception as e:
+            logger.warning("Failed to load ONNX embedding model, using SentenceTransformer: %s", e)
+            return None
+    
+    def _configure_cpu_threads(self) -> None:
+        """Pin PyTorch's intra/inter-op thread pools for CPU embedding (EMBED_NUM_THREADS)."""
+        num_threads = Config.EMBED_NUM_THREADS or os.cpu_count() or 1
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:
+            # Can only be set before any inter-op parallel work has started
+            pass
+    
+    def _get_embed_device(self) -> str:
+        """Get the device for the embedding model from EMBED_DEVICE ('auto' picks the fastest available)."""
+        if Config.EMBED_DEVICE != "auto":
+            return Config.EMBED_DEVICE
+        if torch.cuda.is_available():
+            return "cuda"
+        elif torch.backends.mps.is_available():
+            return "mps"
+        else:
+            return "cpu"
+    
     def _chunk_text(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """Split text into overlapping chunks."""
-        if len(text) <= chunk_size:
-            return [text]
+        return list(self._iter_chunks(text, chunk_size, overlap))
+    
+    def _iter_chunks(self, text: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+        """Yield overlapping chunks of text one at a time."""
+        text_len = len(text)
+        if text_len <= chunk_size:
+            yield text
+            return
         
-        chunks = []
         start = 0
         
-        while start < len(text):
+        while start < text_len:
             end = start + chunk_size
             
-            # Try to break at sentence boundary
-            if end < len(text):
-                for i in range(end - 100, end):
-                    if i > start and text[i] in '.!?':
-                        end = i + 1
-                        break
+            # Try to break at the last sentence boundary in the final 100 characters
+            if end < text_len:
+                window_start = max(start + 1, end - 100)
+                cut = max(
+                    text.rfind('.', window_start, end),
+                    text.rfind('!', window_start, end),
+                    text.rfind('?', window_start, end)
+                )
+                if cut > start:
+                    end = cut + 1
             
             chunk = text[start:end].strip()
             if chunk:
-                chunks.append(chunk)
+                yield chunk
             
             start = max(start + 1, end - overlap)
             
-            if start >= len(text):
+            if start >= text_len:
                 break
-        
-        return chunks
+    
+    def _iter_chunk_batches(self, text: str, batch_size: int) -> Iterator[List[str]]:
+        """Yield lists of at most batch_size consecutive chunks of text."""
+        batch = []
+        for chunk in self._iter_chunks(text):
+            batch.append(chunk)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
     
     def _prepare_context(self, chunks: List[Dict[str, Any]]) -> str:
         """Prepare context text from retrieved chunks."""
@@ -351,14 +688,18 @@ class RAGSystem:
     
     def _create_prompt(self, query: str, context: str, target_language: str) -> str:
         """Create prompt for answer generation."""
+        template = self._prompt_templates.get(target_language)
+        if template is None:
+            template = self._build_prompt_template(target_language)
+        return template.format(context=context, query=query)
+    
+    def _build_prompt_template(self, target_language: str) -> str:
+        """Build the answer prompt template for a response language."""
         language_name = Config.SUPPORTED_LANGUAGES.get(target_language, target_language)
         
-        prompt = f"""Based on the following context from the uploaded document, please answer the user's question in {language_name}.
-
-Context:
-{context}
-
-Question: {query}
+        # Fixed instructions first and request-specific content last, so the prompt
+        # prefix is byte-identical across requests and eligible for prefix caching
+        return f"""Based on the context from the uploaded document below, please answer the user's question in {language_name}.
 
 Instructions:
 1. Answer based only on the information provided in the context
@@ -367,12 +708,22 @@ Instructions:
 4. Be precise and helpful
 5. Include relevant details from the context
 
+Context:
+{{context}}
+
+Question: {{query}}
+
 Answer:"""
-        
-        return prompt
     
     def _get_system_prompt(self, target_language: str) -> str:
         """Get system prompt for the chatbot."""
+        system_prompt = self._system_prompts.get(target_language)
+        if system_prompt is None:
+            system_prompt = self._build_system_prompt(target_language)
+        return system_prompt
+    
+    def _build_system_prompt(self, target_language: str) -> str:
+        """Build the system prompt for a response language."""
         language_name = Config.SUPPORTED_LANGUAGES.get(target_language, target_language)
         
         return f"""You are a helpful multilingual document assistant. Your task is to answer questions about uploaded documents accurately and clearly in {language_name}.
@@ -385,6 +736,18 @@ Key guidelines:
 - Be helpful and professional
 - Cite specific parts of the document when relevant"""
     
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Get the ChromaDB collection metadata, including HNSW index parameters."""
+        # Embeddings are L2-normalized at encode time, so inner product equals cosine
+        # similarity without the per-distance norm computation
+        return {
+            "hnsw:space": "ip",
+            "hnsw:M": Config.HNSW_M,
+            "hnsw:construction_ef": Config.HNSW_EF_CONSTRUCTION,
+            "hnsw:search_ef": Config.HNSW_EF_SEARCH,
+            "hnsw:num_threads": os.cpu_count() or 1
+        }
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the current document collection."""
         try:
@@ -396,7 +759,7 @@ Key guidelines:
             return {
                 "total_chunks": count,
                 "collection_name": "document_chunks",
-                "embedding_model": "all-MiniLM-L6-v2"
+                "embedding_model": EMBEDDING_MODEL_NAME
             }
             
         except Exception as e:
@@ -410,20 +773,29 @@ Key guidelines:
                 self.chroma_client.delete_collection("document_chunks")
                 self.collection = self.chroma_client.create_collection(
                     name="document_chunks",
-                    metadata={"hnsw:space": "cosine"}
+                    metadata=self._collection_metadata()
                 )
                 return True
+            return False
         except Exception as e:
             error_msg = f"Failed to clear collection: {e}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             safe_gradio_notification("error", error_msg)
             return False
     
     def count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken."""
         try:
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-            return len(encoding.encode(text))
+            return len(self._tokenizer.encode(text, disallowed_special=()))
+        except Exception:
+            # Fallback: rough estimation
+            return len(text.split()) * 1.3
+    
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for many texts at once using tiktoken's multithreaded encoder."""
+        try:
+            encoded = self._tokenizer.encode_batch(texts, num_threads=os.cpu_count() or 1, disallowed_special=())
+            return [len(tokens) for tokens in encoded]
         except Exception:
             # Fallback: rough estimation
-            return len(text.split()) * 1.3 
\ No newline at end of file
+            return [len(text.split()) * 1.3 for text in texts] 
\ No newline at end of file
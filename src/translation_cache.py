@@ -0,0 +1,202 @@
+"""
+Persistent translation cache shared by the Google Cloud and NLLB translation services.
+Both services store results in one SQLite database (keys carry the service name) through a
+single per-file instance with an in-process LRU in front, so warm lookups are a dict access
+and cold lookups are one indexed SELECT.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Entries larger than this are stored zstd-compressed
+_COMPRESS_MIN_BYTES = 4096
+
+# One-byte frame markers in front of the stored value (rows written before had none)
+_JSON_MARKER = b"J"
+_ZSTD_MARKER = b"Z"
+
+# One cache per database file, shared by every service that uses it
+_CACHES: Dict[str, "TranslationCache"] = {}
+_CACHES_LOCK = threading.Lock()
+
+def get_translation_cache(path: str = "cache/translations.sqlite") -> "TranslationCache":
+    """
+    Get the shared cache for a database file, creating it on first use.
+
+    Services sharing a file must share one instance: separate instances would hold separate
+    connections competing for the write lock, and separate in-memory LRUs that go stale when
+    another instance deletes entries.
+
+    Args:
+        path: SQLite database path
+
+    Returns:
+        The process-wide TranslationCache for that path
+    """
+    key = str(Path(path).resolve())
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = TranslationCache(path)
+        return cache
+
+class TranslationCache:
+    """SQLite-backed cache of translation results keyed by cache key."""
+
+    def __init__(self, path: str = "cache/translations.sqlite", memory_size: int = 4096):
+        self.path = Path(path)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Nesting depth of transaction() blocks; writes are committed when it drops to zero
+        self._transaction_depth = 0
+        # zstd contexts are not thread-safe; they are only used while holding the lock
+        self._compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+        self.path.parent.mkdir(exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached translation result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached result, or None if not cached
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+            else:
+                row = self._conn.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                result = self._decode(row[0])
+                self._remember(key, result)
+        # Callers annotate results (e.g. the method name), so never hand out the cached dict
+        return dict(result)
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a translation result.
+
+        Args:
+            key: Cache key
+            result: Translation result dict (JSON-serializable)
+        """
+        with self._lock:
+            value = self._encode(result)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", (key, value)
+            )
+            if self._transaction_depth == 0:
+                self._conn.commit()
+            self._remember(key, dict(result))
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group the writes made inside the block into a single commit."""
+        with self._lock:
+            self._transaction_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    # Entries written before an error are still valid, so commit rather than roll back
+                    self._conn.commit()
+
+    def delete_matching(self, pattern: Optional[str] = None) -> int:
+        """
+        Delete cached results whose key contains a pattern.
+
+        Args:
+            pattern: Substring to match in the cache key (if None, deletes everything)
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            with self._conn:
+                if pattern is None:
+                    cursor = self._conn.execute("DELETE FROM translations")
+                    self._memory.clear()
+                else:
+                    # instr() is a case-sensitive substring match, like the in-memory check below
+                    cursor = self._conn.execute("DELETE FROM translations WHERE instr(key, ?) > 0", (pattern,))
+                    for key in [key for key in self._memory if pattern in key]:
+                        del self._memory[key]
+            return cursor.rowcount
+
+    def stats(self) -> Tuple[int, int]:
+        """
+        Get cache size.
+
+        Returns:
+            Tuple of (entry count, total stored bytes)
+        """
+        with self._lock:
+            count, total_bytes = self._conn.execute(
+                "SELECT count(*), coalesce(sum(length(value)), 0) FROM translations"
+            ).fetchone()
+        return count, total_bytes
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        """Insert into the in-memory LRU; the caller holds the lock."""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _encode(self, result: Dict[str, Any]) -> bytes:
+        """Serialize a result for storage (compact JSON, zstd-compressed when large)."""
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        if self._compressor is not None and len(data) > _COMPRESS_MIN_BYTES:
+            return _ZSTD_MARKER + self._compressor.compress(data)
+        return _JSON_MARKER + data
+
+    def _decode(self, value: bytes) -> Dict[str, Any]:
+        """Deserialize a stored result."""
+        marker = value[:1]
+        if marker == _ZSTD_MARKER:
+            if self._decompressor is None:
+                raise RuntimeError("Cache entry is zstd-compressed but zstandard is not installed")
+            data = self._decompressor.decompress(value[1:])
+        elif marker == _JSON_MARKER:
+            data = value[1:]
+        else:
+            data = value
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
@@ -3,47 +3,129 @@ Translation service module for multilingual document chatbot.
 Supports Google Translate API and NLLB open-source translation.
 """
 
-import gradio as gr
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from google.cloud import translate_v3 as translate
-import langdetect
+from google.oauth2 import service_account
+import re
 import json
 import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.config import Config
+from src.gradio_notifications import safe_gradio_notification
+from src import language_detection
+from src.translation_cache import get_translation_cache
 from src.language_mapping import LanguageMapping, TranslationService as ServiceType
 from src.nllb_translation_service import NLLBTranslationService
 
-def safe_gradio_notification(notification_type: str, message: str):
-    """Safely call Gradio notifications, only if in proper context."""
-    try:
-        if notification_type == "info":
-            gr.Info(message)
-        elif notification_type == "warning":
-            gr.Warning(message)
-        elif notification_type == "error":
-            gr.Error(message)
-    except Exception:
-        # If Gradio context is not available, just skip the notification
-        # The print statement will still work
-        pass
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# A sentence runs up to and including its closing punctuation (ASCII or CJK full-width)
+# and trailing whitespace; the second branch catches trailing text without sentence punctuation
+_SENT_RE = re.compile(r'[^.!?。！？]*[.!?。！？]+\s*|[^.!?。！？]+\Z')
+
+# Whitespace collapsed before splitting long texts (line breaks are kept, other runs become one space)
+_LINE_BREAK_SPACE_RE = re.compile(r'[^\S\n]*\n[^\S\n]*')
+_INLINE_SPACE_RE = re.compile(r'[^\S\n]+')
+
+# Google Cloud Translation accepts at most 30K bytes of content per request
+_MAX_CHUNK_BYTES = 30000
+
+# Per-request limits for batched translate_text calls
+_MAX_CONTENTS_PER_REQUEST = 1024
+_MAX_REQUEST_CHARS = 30000
+
+# Sub-batches of very large documents are sent concurrently (gRPC releases the GIL while waiting)
+_MAX_TRANSLATE_WORKERS = 8
+
+# Number of translated chunks kept in memory across translation requests
+_CHUNK_CACHE_SIZE = 4096
+
+# Keep the HTTP/2 channel warm between requests
+_GRPC_CHANNEL_OPTIONS = [("grpc.keepalive_time_ms", 30000)]
+
+def _create_translate_client(credentials=None) -> translate.TranslationServiceClient:
+    """Build a Translation v3 client on a gRPC channel with keepalive enabled."""
+    transport_class = translate.TranslationServiceClient.get_transport_class("grpc")
+    channel = transport_class.create_channel(credentials=credentials, options=_GRPC_CHANNEL_OPTIONS)
+    return translate.TranslationServiceClient(transport=transport_class(channel=channel))
+
+# Joins batch texts for the composite batch cache key (a control character unlikely in documents)
+_BATCH_SEPARATOR = "\x1e"
+
+# Read-only legacy language table, bound once for the lookups below
+_SUPPORTED_LANGUAGES = Config.SUPPORTED_LANGUAGES
+_SUPPORTED_CODES = frozenset(_SUPPORTED_LANGUAGES)
+
+# Document summary labels; translated once per target language and cached
+_SUMMARY_LABELS = ("Document", "File Type", "Pages", "Word Count", "Content Preview")
+
+_SUMMARY_TEMPLATE = """{labels[0]}: {filename}
+{labels[1]}: {file_type}
+{labels[2]}: {pages}
+{labels[3]}: {word_count}
+
+{labels[4]}:
+{preview}..."""
+
+# Characters encoded per hasher update when hashing long texts without xxhash
+_HASH_SLICE_CHARS = 65536
+
+def _content_hash(text: str) -> str:
+    """Hash text for cache keys (128-bit xxh3 when available, 128-bit BLAKE2b otherwise)."""
+    if XXHASH_AVAILABLE:
+        # xxhash accepts str directly, skipping the intermediate UTF-8 bytes object
+        return xxhash.xxh3_128_hexdigest(text)
+    if len(text) <= _HASH_SLICE_CHARS:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    # Encode long texts slice by slice so the full UTF-8 copy is never held in memory
+    hasher = hashlib.blake2b(digest_size=16)
+    for start in range(0, len(text), _HASH_SLICE_CHARS):
+        hasher.update(text[start:start + _HASH_SLICE_CHARS].encode('utf-8'))
+    return hasher.hexdigest()
 
 class TranslationService:
     """Service for translating text between different languages."""
     
+    # Client shared by all instances so new services reuse the open, authenticated gRPC channel
+    _shared_client: Optional[translate.TranslationServiceClient] = None
+    
     def __init__(self):
         
-        print("Initializing Translation Service")
-        print("Config.GOOGLE_PROJECT_ID", Config.GOOGLE_PROJECT_ID)
-        print("Config.GOOGLE_TRANSLATE_API_KEY", Config.GOOGLE_TRANSLATE_API_KEY)
+        logger.debug("Initializing Translation Service")
+        # Never log the credentials themselves
+        logger.debug("Google project configured: %s, credentials configured: %s",
+                     bool(Config.GOOGLE_PROJECT_ID), bool(Config.GOOGLE_TRANSLATE_API_KEY))
         
         self.translate_client = None
         self.cache_dir = Path("cache")
         self.project_id = Config.GOOGLE_PROJECT_ID
         self.location = "global"
+        self.parent = f"projects/{self.project_id}/locations/{self.location}"
+        # Fields shared by every translate_text request
+        self._request_base = {"parent": self.parent, "mime_type": "text/plain"}
         
         # Create cache directory if it doesn't exist
         self.cache_dir.mkdir(exist_ok=True)
+        self.translation_cache = get_translation_cache(str(self.cache_dir / "translations.sqlite"))
+        
+        # (source, target, chunk) -> (translated chunk, detected source language)
+        self._chunk_cache: "OrderedDict[Tuple[str, str, str], Tuple[str, Optional[str]]]" = OrderedDict()
+        self._chunk_cache_lock = threading.Lock()
+        
+        # Reuse the client created by an earlier instance
+        if TranslationService._shared_client is not None:
+            self.translate_client = TranslationService._shared_client
+            return
         
         # Initialize Google Cloud Translate v3 client with service account
         try:
@@ -55,29 +137,34 @@ class TranslationService:
                 try:
                     # Try to parse as JSON service account
                     service_account_info = json.loads(Config.GOOGLE_TRANSLATE_API_KEY)
-                    self.translate_client = translate.TranslationServiceClient.from_service_account_info(service_account_info)
-                    print("✅ Google Cloud Translate v3 initialized with service account.")
+                    credentials = service_account.Credentials.from_service_account_info(service_account_info)
+                    self.translate_client = _create_translate_client(credentials)
+                    logger.info("Google Cloud Translate v3 initialized with service account")
                     safe_gradio_notification("info", "✅ Google Cloud Translate v3 initialized with service account.")
                 except json.JSONDecodeError:
                     # If not JSON, treat as file path
                     import os
                     if os.path.exists(Config.GOOGLE_TRANSLATE_API_KEY):
                         os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = Config.GOOGLE_TRANSLATE_API_KEY
-                        self.translate_client = translate.TranslationServiceClient()
-                        print("✅ Google Cloud Translate v3 initialized with service account file.")
+                        self.translate_client = _create_translate_client()
+                        logger.info("Google Cloud Translate v3 initialized with service account file")
                         safe_gradio_notification("info", "✅ Google Cloud Translate v3 initialized with service account file.")
                     else:
                         raise ValueError("GOOGLE_TRANSLATE_API_KEY must be either JSON content or path to service account file")
             else:
                 # Try Application Default Credentials
-                self.translate_client = translate.TranslationServiceClient()
-                print("✅ Google Cloud Translate v3 initialized with Application Default Credentials.")
+                self.translate_client = _create_translate_client()
+                logger.info("Google Cloud Translate v3 initialized with Application Default Credentials")
                 safe_gradio_notification("info", "✅ Google Cloud Translate v3 initialized with Application Default Credentials.")
             
+            TranslationService._shared_client = self.translate_client
+            
+            # Open the channel in the background so the first user request skips the handshake
+            threading.Thread(target=self.warmup, daemon=True).start()
+            
         except Exception as e:
-            error_msg = f"❌ Could not initialize Google Cloud Translate: {e}"
-            print(error_msg)
-            safe_gradio_notification("error", error_msg)
+            logger.warning("Could not initialize Google Cloud Translate: %s", e)
+            safe_gradio_notification("error", f"❌ Could not initialize Google Cloud Translate: {e}")
             
             setup_info = """
             Translation Setup Required
@@ -97,40 +184,33 @@ class TranslationService:
             Option 3: Application Default Credentials
             Run: gcloud auth application-default login
             """
-            print(setup_info)
+            logger.info(setup_info)
             safe_gradio_notification("info", "Please check the console for Google Cloud Translation setup instructions.")
     
-    def _generate_cache_key(self, filename: str, text: str, target_language: str, source_language: str = 'auto') -> str:
+    def _generate_cache_key(self, filename: str, text: str, target_language: str, source_language: str = 'auto',
+                            namespace: str = "GoogleCloud") -> str:
         """Generate a unique cache key for translation."""
         # Create a hash of the content and parameters to ensure uniqueness
-        content_hash = hashlib.md5(text.encode('utf-8')).hexdigest()[:8]
+        content_hash = _content_hash(text)
         clean_filename = Path(filename).stem
-        # Include service name to avoid conflicts with NLLB cache
-        cache_key = f"{clean_filename}__GoogleCloud__{source_language}__{target_language}__{content_hash}"
+        # The namespace keeps NLLB entries and whole-batch entries apart from single translations
+        # (the filename can't: Path.stem drops suffixes like '.pdf_batch')
+        cache_key = f"{clean_filename}__{namespace}__{source_language}__{target_language}__{content_hash}"
         return cache_key
     
     def _save_translation_cache(self, cache_key: str, translation_result: Dict[str, Any]) -> None:
         """Save translation result to cache."""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(translation_result, f, ensure_ascii=False, indent=2)
+            self.translation_cache.set(cache_key, translation_result)
         except Exception as e:
-            warning_msg = f"Failed to save translation cache: {e}"
-            print(f"Warning: {warning_msg}")
-            safe_gradio_notification("warning", warning_msg)
+            logger.warning("Failed to save translation cache: %s", e)
     
     def _load_translation_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Load translation result from cache."""
         try:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self.translation_cache.get(cache_key)
         except Exception as e:
-            warning_msg = f"Failed to load translation cache: {e}"
-            print(f"Warning: {warning_msg}")
-            safe_gradio_notification("warning", warning_msg)
+            logger.warning("Failed to load translation cache: %s", e)
         return None
     
     def detect_language(self, text: str) -> Optional[str]:
@@ -144,16 +224,14 @@ class TranslationService:
             Language code (e.g., 'en', 'es', 'hi') or None if detection fails
         """
         try:
-            # Use langdetect library
-            detected = langdetect.detect(text[:1000])  # Use first 1000 chars for detection
-            return detected
+            # fastText / CLD3 when available, langdetect otherwise
+            return language_detection.detect_language(text)
         except Exception as e:
-            warning_msg = f"Language detection failed: {e}"
-            print(f"Warning: {warning_msg}")
-            safe_gradio_notification("warning", warning_msg)
+            logger.warning("Language detection failed: %s", e)
             return None
     
-    def translate_text(self, text: str, target_language: str, source_language: str = 'auto', filename: Optional[str] = None) -> Dict[str, Any]:
+    def translate_text(self, text: str, target_language: str, source_language: str = 'auto', filename: Optional[str] = None,
+                       pending_writes: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Translate text to target language with caching support.
         
@@ -162,6 +240,7 @@ class TranslationService:
             target_language: Target language code
             source_language: Source language code (default: 'auto' for auto-detection)
             filename: Optional filename for caching (if provided, results will be cached)
+            pending_writes: Optional dict that collects cache writes instead of storing them
             
         Returns:
             Dict with translation result, confidence, and metadata
@@ -169,54 +248,59 @@ class TranslationService:
         if not text.strip():
             return {"success": False, "error": "Empty text provided"}
         
+        # Reject unsupported targets before any cache lookup or API call
+        if not LanguageMapping.is_language_supported(target_language, ServiceType.GOOGLE_CLOUD):
+            return {"success": False, "error": f"Target language '{target_language}' not supported by Google Cloud Translate"}
+        
+        # If source and target are the same, return original text without hashing or a
+        # cache lookup. With 'auto' the source is detected by Google as part of the
+        # translation request instead.
+        if source_language == target_language:
+            return {
+                "success": True,
+                "translated_text": text,
+                "source_language": source_language,
+                "target_language": target_language,
+                "method": "no_translation_needed"
+            }
+        
         # Check cache first if filename is provided
-        print("Checking cache for filename", filename)
+        logger.debug("Checking cache for filename %s", filename)
         cache_key = None
         if filename:
             cache_key = self._generate_cache_key(filename, text, target_language, source_language)
             cached_result = self._load_translation_cache(cache_key)
-            if cached_result:
+            # Batch entries written under single-translation keys by earlier versions lack the text
+            if cached_result and "translated_text" in cached_result:
                 cached_result["method"] = cached_result.get("method", "cached") + "_cached"
-                print("cache found")
+                logger.debug("Cache found for %s", cache_key)
                 return cached_result
-        print("no cache found")
-        
-        # If source and target are the same, return original text
-        detected_lang = self.detect_language(text)
-        if detected_lang == target_language:
-            result = {
-                "success": True,
-                "translated_text": text,
-                "source_language": detected_lang,
-                "target_language": target_language,
-                "method": "no_translation_needed"
-            }
-            
-            # Save to cache if filename provided
-            if filename and cache_key:
-                self._save_translation_cache(cache_key, result)
-            
-            return result
+        logger.debug("No cache found")
         
         # Use Google Cloud Translate API
         try:
             result = self._translate_with_google_cloud(text, target_language, source_language)
             
-            # print("Google Cloud Translation result", result)
-            
             if result["success"]:
-                result["method"] = "google_cloud_translate"
+                if result.get("source_language") == target_language:
+                    # Google detected the text is already in the target language
+                    result["translated_text"] = text
+                    result["method"] = "no_translation_needed"
+                else:
+                    result["method"] = "google_cloud_translate"
                 
                 # Save to cache if filename provided
                 if filename and cache_key:
-                    print("Saving translation cache", cache_key)
-                    self._save_translation_cache(cache_key, result)
+                    if pending_writes is not None:
+                        pending_writes[cache_key] = dict(result)
+                    else:
+                        logger.debug("Saving translation cache %s", cache_key)
+                        self._save_translation_cache(cache_key, result)
                 
                 return result
         except Exception as e:
-            warning_msg = f"Google Cloud Translation failed: {e}"
-            print(f"Warning: {warning_msg}")
-            safe_gradio_notification("warning", warning_msg)
+            # Callers get the error in the result; batch_translate reports failures once per batch
+            logger.warning("Google Cloud Translation failed: %s", e)
             return {"success": False, "error": f"Translation failed: {e}"}
     
     def _translate_with_google_cloud(self, text: str, target_lang: str, source_lang: str) -> Dict[str, Any]:
@@ -228,41 +312,48 @@ class TranslationService:
             raise Exception("Google Cloud Project ID not configured")
         
         try:
-            # Construct the parent path for the API request
-            parent = f"projects/{self.project_id}/locations/{self.location}"
-            
             # Split long text into chunks to avoid API limits
             chunks = self._split_text_for_translation(text)
-            translated_chunks = []
-            detected_source_lang = source_lang
             
-            for chunk in chunks:
-                # Prepare request parameters
-                request_params = {
-                    "parent": parent,
-                    "contents": [chunk],
-                    "mime_type": "text/plain",
-                    "target_language_code": target_lang,
-                }
-                
-                # Only add source language if it's not auto-detection
-                if source_lang != 'auto':
-                    request_params["source_language_code"] = source_lang
-                
-                # Translate the chunk
-                response = self.translate_client.translate_text(request=request_params)
-                
-                if response.translations:
-                    translation = response.translations[0]
-                    translated_chunks.append(translation.translated_text)
-                    
-                    # Capture detected source language from first translation if auto-detection
-                    if source_lang == 'auto' and hasattr(translation, 'detected_language_code'):
-                        detected_source_lang = translation.detected_language_code
+            # Only chunks that were not translated before go to the API (each once)
+            chunk_results = self._get_cached_chunks(chunks, target_lang, source_lang)
+            missing_chunks = list(dict.fromkeys(
+                chunk for chunk, cached in zip(chunks, chunk_results) if cached is None
+            ))
+            
+            if missing_chunks:
+                # Send the chunks in as few requests as the API limits allow
+                batches = self._group_chunks_for_requests(missing_chunks)
+                if len(batches) == 1:
+                    batch_results = [self._translate_chunk_batch(batches[0], target_lang, source_lang)]
                 else:
-                    translated_chunks.append(chunk)  # Fallback to original text
+                    with ThreadPoolExecutor(max_workers=min(_MAX_TRANSLATE_WORKERS, len(batches))) as executor:
+                        batch_results = list(executor.map(
+                            lambda batch: self._translate_chunk_batch(batch, target_lang, source_lang),
+                            batches
+                        ))
+                
+                new_results = {}
+                for batch, (batch_translations, batch_detected_lang) in zip(batches, batch_results):
+                    for chunk, translated in zip(batch, batch_translations):
+                        new_results[chunk] = (translated, batch_detected_lang)
+                self._cache_chunks(new_results, target_lang, source_lang)
+                chunk_results = [cached or new_results[chunk] for chunk, cached in zip(chunks, chunk_results)]
             
-            translated_text = ' '.join(translated_chunks)
+            translated_chunks = []
+            detected_source_lang = source_lang
+            for translated, chunk_detected_lang in chunk_results:
+                translated_chunks.append(translated)
+                # Capture detected source language from the first translation if auto-detection
+                if detected_source_lang == 'auto' and chunk_detected_lang:
+                    detected_source_lang = chunk_detected_lang
+            
+            # Chunks already carry their separators; restore each chunk's trailing whitespace
+            # (the API trims it) instead of inserting spaces, which would break CJK text
+            translated_text = ''.join(
+                translated.rstrip() + chunk[len(chunk.rstrip()):]
+                for chunk, translated in zip(chunks, translated_chunks)
+            )
             
             return {
                 "success": True,
@@ -274,32 +365,128 @@ class TranslationService:
         except Exception as e:
             raise Exception(f"Google Cloud translation failed: {e}")
     
+    def _get_cached_chunks(self, chunks: List[str], target_lang: str, source_lang: str) -> List[Optional[Tuple[str, Optional[str]]]]:
+        """Look up previously translated chunks; misses are None."""
+        results = []
+        with self._chunk_cache_lock:
+            for chunk in chunks:
+                key = (source_lang, target_lang, chunk)
+                cached = self._chunk_cache.get(key)
+                if cached is not None:
+                    self._chunk_cache.move_to_end(key)
+                results.append(cached)
+        return results
+    
+    def _cache_chunks(self, chunk_results: Dict[str, Tuple[str, Optional[str]]], target_lang: str, source_lang: str) -> None:
+        """Remember translated chunks, evicting the least recently used beyond the cache size."""
+        with self._chunk_cache_lock:
+            for chunk, result in chunk_results.items():
+                self._chunk_cache[(source_lang, target_lang, chunk)] = result
+            while len(self._chunk_cache) > _CHUNK_CACHE_SIZE:
+                self._chunk_cache.popitem(last=False)
+    
+    def _translate_chunk_batch(self, chunks: List[str], target_lang: str, source_lang: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Translate a group of chunks with a single translate_text request.
+        
+        Args:
+            chunks: Chunks to translate (within the per-request limits)
+            target_lang: Target language code
+            source_lang: Source language code or 'auto'
+            
+        Returns:
+            Tuple of (translated chunks in input order, detected source language or None)
+        """
+        # Prepare request parameters
+        request_params = dict(self._request_base, contents=chunks, target_language_code=target_lang)
+        
+        # Only add source language if it's not auto-detection
+        if source_lang != 'auto':
+            request_params["source_language_code"] = source_lang
+        
+        response = self.translate_client.translate_text(request=request_params)
+        translations = list(response.translations)
+        
+        # Fall back to the original text for any chunk the API did not return
+        translated = [translation.translated_text for translation in translations]
+        translated.extend(chunks[len(translated):])
+        
+        # detected_language_code is part of the response schema (empty unless auto-detected)
+        detected_lang = None
+        if source_lang == 'auto' and translations and translations[0].detected_language_code:
+            detected_lang = translations[0].detected_language_code
+        return translated, detected_lang
+    
+    def _group_chunks_for_requests(self, chunks: List[str]) -> List[List[str]]:
+        """Group chunks into request-sized batches (item count and total characters)."""
+        batches = []
+        current_batch = []
+        current_chars = 0
+        
+        for chunk in chunks:
+            if current_batch and (len(current_batch) >= _MAX_CONTENTS_PER_REQUEST
+                                  or current_chars + len(chunk) > _MAX_REQUEST_CHARS):
+                batches.append(current_batch)
+                current_batch = []
+                current_chars = 0
+            current_batch.append(chunk)
+            current_chars += len(chunk)
+        
+        if current_batch:
+            batches.append(current_batch)
+        return batches
+    
     def _split_text_for_translation(self, text: str, max_length: int = 5000) -> List[str]:
-        """Split text into chunks suitable for translation APIs."""
+        """
+        Split text into chunks suitable for translation APIs.
+        
+        Chunks end on sentence boundaries and keep their trailing whitespace,
+        so concatenating them reproduces the text (with runs of spaces collapsed
+        when it is over the limit).
+        """
         if len(text) <= max_length:
             return [text]
         
-        chunks = []
-        current_chunk = ""
+        # Redundant whitespace (e.g. from PDF extraction) often pushes a text over the limit
+        text = _INLINE_SPACE_RE.sub(' ', _LINE_BREAK_SPACE_RE.sub('\n', text))
+        if len(text) <= max_length:
+            return [text]
         
-        # Split by sentences first
-        sentences = text.replace('.', '.|').replace('!', '!|').replace('?', '?|').split('|')
+        chunks = []
+        chunk_start = 0
+        chunk_end = 0
+        chunk_bytes = 0
+        is_ascii = text.isascii()
+        # Hard splits must respect the byte limit too (UTF-8 uses up to 4 bytes per character)
+        piece_length_limit = max_length if is_ascii else min(max_length, _MAX_CHUNK_BYTES // 4)
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        # Split by sentences first (single compiled regex pass); chunks are contiguous
+        # spans of the text, so only offsets are tracked until a chunk is emitted
+        for match in _SENT_RE.finditer(text):
+            sentence_start, sentence_end = match.span()
+            
+            # Hard-split sentences that are longer than a whole chunk
+            for piece_start in range(sentence_start, sentence_end, piece_length_limit):
+                piece_end = min(piece_start + piece_length_limit, sentence_end)
+                piece_length = piece_end - piece_start
+                piece_bytes = piece_length if is_ascii else len(text[piece_start:piece_end].encode('utf-8'))
                 
-            # If adding this sentence would exceed limit, save current chunk
-            if len(current_chunk) + len(sentence) > max_length and current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence
-            else:
-                current_chunk += (" " + sentence if current_chunk else sentence)
+                # If adding this piece would exceed the character or byte limit, save current chunk
+                if chunk_end > chunk_start and (chunk_end - chunk_start + piece_length > max_length
+                                                or chunk_bytes + piece_bytes > _MAX_CHUNK_BYTES):
+                    chunk = text[chunk_start:chunk_end]
+                    if not chunk.isspace():
+                        chunks.append(chunk)
+                    chunk_start = piece_start
+                    chunk_bytes = 0
+                
+                chunk_end = piece_end
+                chunk_bytes += piece_bytes
         
         # Add the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        chunk = text[chunk_start:chunk_end]
+        if chunk and not chunk.isspace():
+            chunks.append(chunk)
         
         return chunks
     
@@ -315,25 +502,28 @@ class TranslationService:
             Translated document information
         """
         try:
-            # Create a summary of the document
-            text_preview = document_info.get('text', '')[:500] + "..."
             filename = document_info.get('filename', 'Unknown')
             
-            summary_text = f"""Document: {filename}
-File Type: {document_info.get('file_type', 'Unknown')}
-Pages: {document_info.get('pages', 'Unknown')}
-Word Count: {document_info.get('word_count', 'Unknown')}
-
-Content Preview:
-{text_preview}"""
-            
-            # Use filename for caching the document summary translation
-            translation_result = self.translate_text(summary_text, target_language, filename=f"{filename}_summary")
+            # Only the content preview is document-specific; use filename for caching its translation
+            text_preview = document_info.get('text', '')[:500]
+            if text_preview.strip():
+                translation_result = self.translate_text(text_preview, target_language, filename=f"{filename}_summary")
+            else:
+                # Nothing to translate; the metadata summary is still returned
+                translation_result = {"success": True, "translated_text": text_preview, "source_language": None}
             
             if translation_result["success"]:
+                summary_text = _SUMMARY_TEMPLATE.format(
+                    labels=self._get_summary_labels(target_language),
+                    filename=filename,
+                    file_type=document_info.get('file_type', 'Unknown'),
+                    pages=document_info.get('pages', 'Unknown'),
+                    word_count=document_info.get('word_count', 'Unknown'),
+                    preview=translation_result["translated_text"]
+                )
                 return {
                     "success": True,
-                    "translated_summary": translation_result["translated_text"],
+                    "translated_summary": summary_text,
                     "source_language": translation_result.get("source_language"),
                     "target_language": target_language
                 }
@@ -343,22 +533,38 @@ Content Preview:
         except Exception as e:
             return {"success": False, "error": f"Failed to translate document summary: {e}"}
     
-    def get_supported_languages(self) -> Dict[str, str]:
-        """Get list of supported languages for translation."""
-        return Config.SUPPORTED_LANGUAGES.copy()
+    def _get_summary_labels(self, target_language: str) -> Tuple[str, ...]:
+        """Get the summary labels in the target language, falling back to English."""
+        if target_language == 'en':
+            return _SUMMARY_LABELS
+        
+        # One line per label; the persistent cache makes this a single API call per language
+        result = self.translate_text("\n".join(_SUMMARY_LABELS), target_language, 'en', filename="summary_labels")
+        if result and result.get("success"):
+            labels = tuple(label.strip() for label in result["translated_text"].split("\n"))
+            if len(labels) == len(_SUMMARY_LABELS):
+                return labels
+        return _SUMMARY_LABELS
+    
+    def get_supported_languages(self) -> Mapping[str, str]:
+        """Get list of supported languages for translation (read-only view)."""
+        return _SUPPORTED_LANGUAGES
     
     def is_translation_needed(self, text: str, target_language: str) -> bool:
         """Check if translation is needed based on detected language."""
+        # A text in another script always needs translation; skip the statistical detector
+        if language_detection.is_script_mismatch(text, target_language):
+            return True
         detected_lang = self.detect_language(text)
         return detected_lang != target_language if detected_lang else True
     
     def get_language_name(self, language_code: str) -> str:
         """Get full language name from language code."""
-        return Config.SUPPORTED_LANGUAGES.get(language_code, language_code.upper())
+        return _SUPPORTED_LANGUAGES.get(language_code, language_code.upper())
     
     def validate_language_code(self, language_code: str) -> bool:
         """Validate if language code is supported."""
-        return language_code in Config.SUPPORTED_LANGUAGES
+        return language_code in _SUPPORTED_CODES
     
     def batch_translate(self, texts: List[str], target_language: str, source_language: str = 'auto', filename: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -373,47 +579,97 @@ Content Preview:
         Returns:
             List of translation results
         """
-        results = []
+        # A fully translated batch is also cached as one entry, so re-runs take a single lookup
+        batch_key = None
+        if filename and texts:
+            batch_key = self._generate_cache_key(
+                filename, _BATCH_SEPARATOR.join(texts), target_language, source_language, namespace="GoogleCloudBatch"
+            )
+            cached_batch = self._load_translation_cache(batch_key)
+            if cached_batch and len(cached_batch.get("results", ())) == len(texts):
+                return [
+                    dict(result, method=result.get("method", "cached") + "_cached", index=i)
+                    for i, result in enumerate(cached_batch["results"])
+                ]
+        
+        results = [None] * len(texts)
         
+        # Translate each distinct text once and fan the result out to every index it occurs at
+        indices_by_text: Dict[str, List[int]] = {}
         for i, text in enumerate(texts):
-            try:
-                # Create a unique filename for each text chunk if base filename provided
-                chunk_filename = f"{filename}_chunk_{i}" if filename else None
-                result = self.translate_text(text, target_language, source_language, filename=chunk_filename)
-                result["index"] = i
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "success": False,
-                    "error": str(e),
-                    "index": i
-                })
+            indices_by_text.setdefault(text, []).append(i)
+        
+        # Cache writes are collected while translating and stored together afterwards, so no
+        # write transaction is held open across the API calls
+        pending_writes: Dict[str, Dict[str, Any]] = {}
+        
+        def translate_unique(item: Tuple[str, List[int]]) -> Dict[str, Any]:
+            text, indices = item
+            # Create a unique filename for each text chunk if base filename provided
+            chunk_filename = f"{filename}_chunk_{indices[0]}" if filename else None
+            return self._translate_batch_item(text, target_language, source_language, chunk_filename, pending_writes)
+        
+        items = list(indices_by_text.items())
+        if len(items) > 1:
+            # Overlap the API round-trips of independent texts
+            with ThreadPoolExecutor(max_workers=min(_MAX_TRANSLATE_WORKERS, len(items))) as executor:
+                unique_results = list(executor.map(translate_unique, items))
+        else:
+            unique_results = [translate_unique(item) for item in items]
+        
+        for (text, indices), result in zip(items, unique_results):
+            for i in indices:
+                # Copy per index since callers may modify the results
+                results[i] = dict(result, index=i)
+        
+        failed = sum(1 for result in results if not result.get("success"))
+        if batch_key and not failed:
+            pending_writes[batch_key] = {"results": results}
+        
+        # Per-text entries are kept so a partially failed batch does not re-translate its
+        # successful texts on the next run
+        if pending_writes:
+            with self.translation_cache.transaction():
+                for cache_key, result in pending_writes.items():
+                    self._save_translation_cache(cache_key, result)
+        
+        if failed:
+            safe_gradio_notification("warning", f"{failed} of {len(results)} translations failed")
         
         return results
     
+    def _translate_batch_item(self, text: str, target_language: str, source_language: str, filename: Optional[str],
+                              pending_writes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Translate one batch entry, turning failures into an error result."""
+        try:
+            result = self.translate_text(text, target_language, source_language, filename=filename,
+                                         pending_writes=pending_writes)
+            if result is None:
+                raise Exception("Translation returned no result")
+            return result
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def clear_translation_cache(self, filename_pattern: Optional[str] = None) -> Dict[str, Any]:
         """
-        Clear translation cache files.
+        Clear translation cache entries.
         
         Args:
-            filename_pattern: Optional pattern to match specific files (if None, clears all)
+            filename_pattern: Optional pattern to match specific cache keys (if None, clears all)
             
         Returns:
-            Dict with operation result and count of files cleared
+            Dict with operation result and count of entries cleared
         """
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            files_removed = 0
-            
-            for cache_file in cache_files:
-                if filename_pattern is None or filename_pattern in cache_file.name:
-                    cache_file.unlink()
-                    files_removed += 1
+            entries_removed = self.translation_cache.delete_matching(filename_pattern)
             
             return {
                 "success": True,
-                "files_removed": files_removed,
-                "message": f"Cleared {files_removed} cache files"
+                "files_removed": entries_removed,
+                "message": f"Cleared {entries_removed} cache entries"
             }
             
         except Exception as e:
@@ -430,12 +686,11 @@ Content Preview:
             Dict with cache statistics
         """
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_size = sum(cache_file.stat().st_size for cache_file in cache_files)
+            total_entries, total_size = self.translation_cache.stats()
             
             return {
                 "success": True,
-                "total_files": len(cache_files),
+                "total_files": total_entries,
                 "total_size_bytes": total_size,
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
                 "cache_directory": str(self.cache_dir)
@@ -447,6 +702,26 @@ Content Preview:
                 "error": f"Failed to get cache stats: {e}"
             }
     
+    def warmup(self) -> bool:
+        """
+        Authenticate and open the gRPC channel ahead of the first translation.
+        
+        Returns:
+            True if the API responded, False otherwise
+        """
+        if not self.translate_client or not self.project_id:
+            return False
+        
+        try:
+            # Listing supported languages is free, unlike a throwaway translation
+            self.translate_client.get_supported_languages(
+                request={"parent": self.parent}
+            )
+            return True
+        except Exception as e:
+            logger.warning("Google Cloud Translate warmup failed: %s", e)
+            return False
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Test the Google Cloud Translate connection.
@@ -469,7 +744,7 @@ Content Preview:
         try:
             # Test with a simple translation using v3 API
             test_text = "Hello"
-            parent = f"projects/{self.project_id}/locations/{self.location}"
+            parent = self.parent
             
             response = self.translate_client.translate_text(
                 request={
@@ -489,7 +764,7 @@ Content Preview:
                         "original": test_text,
                         "translated": translation.translated_text,
                         "target_language": "es",
-                        "detected_source": getattr(translation, 'detected_language_code', 'auto')
+                        "detected_source": translation.detected_language_code or 'auto'
                     }
                 }
             else:
@@ -513,25 +788,41 @@ class TranslationServiceWrapper:
     
     def __init__(self, service_type: Optional[ServiceType] = None):
         self.service_type = service_type or Config.get_translation_service_enum()
-        self.google_service = None
-        self.nllb_service = None
+        # Services initialized so far; switching back to one reuses it
+        self._services: Dict[ServiceType, Any] = {}
         
         # Initialize the appropriate service
-        if self.service_type == ServiceType.GOOGLE_CLOUD:
-            self.google_service = TranslationService()  # Existing Google Cloud service
-        elif self.service_type == ServiceType.NLLB:
-            self.nllb_service = NLLBTranslationService(Config.NLLB_MODEL_NAME)
+        self._services[self.service_type] = self._create_service(self.service_type)
         
-        print(f"🔧 Translation Service initialized with: {LanguageMapping.get_service_display_name(self.service_type)}")
+        logger.info("Translation Service initialized with: %s", LanguageMapping.get_service_display_name(self.service_type))
+    
+    @classmethod
+    def _create_service(cls, service_type: ServiceType):
+        """Create the translation service for a service type."""
+        if service_type == ServiceType.GOOGLE_CLOUD:
+            return TranslationService()  # Existing Google Cloud service
+        elif service_type == ServiceType.NLLB:
+            return cls._create_nllb_service()
+        else:
+            raise ValueError(f"Unknown service type: {service_type}")
+    
+    @staticmethod
+    def _create_nllb_service() -> NLLBTranslationService:
+        """Create the NLLB service from configuration."""
+        return NLLBTranslationService(
+            Config.NLLB_MODEL_NAME,
+            batch_size=Config.NLLB_BATCH_SIZE,
+            quantization=Config.NLLB_QUANTIZATION,
+            ct2_model_dir=Config.NLLB_CT2_MODEL_DIR,
+            compile_model=Config.NLLB_TORCH_COMPILE
+        )
     
     def _get_active_service(self):
         """Get the active translation service based on service type."""
-        if self.service_type == ServiceType.GOOGLE_CLOUD:
-            return self.google_service
-        elif self.service_type == ServiceType.NLLB:
-            return self.nllb_service
-        else:
+        service = self._services.get(self.service_type)
+        if service is None:
             raise ValueError(f"Unknown service type: {self.service_type}")
+        return service
     
     def detect_language(self, text: str) -> Optional[str]:
         """Detect the language of the given text."""
@@ -557,7 +848,7 @@ class TranslationServiceWrapper:
         # This fixes the parameter mismatch issue between Google Cloud and NLLB services
         return service.translate_text(text, target_language, source_language, filename)
     
-    def get_supported_languages(self) -> Dict[str, str]:
+    def get_supported_languages(self) -> Mapping[str, str]:
         """Get list of supported languages for the active service."""
         return LanguageMapping.get_supported_languages(self.service_type)
     
@@ -577,15 +868,12 @@ class TranslationServiceWrapper:
     def switch_service(self, new_service_type: ServiceType):
         """Switch to a different translation service."""
         if new_service_type != self.service_type:
-            self.service_type = new_service_type
-            
             # Initialize new service if needed
-            if new_service_type == ServiceType.GOOGLE_CLOUD and self.google_service is None:
-                self.google_service = TranslationService()
-            elif new_service_type == ServiceType.NLLB and self.nllb_service is None:
-                self.nllb_service = NLLBTranslationService(Config.NLLB_MODEL_NAME)
+            if new_service_type not in self._services:
+                self._services[new_service_type] = self._create_service(new_service_type)
+            self.service_type = new_service_type
             
-            print(f"🔄 Switched to: {LanguageMapping.get_service_display_name(self.service_type)}")
+            logger.info("Switched to: %s", LanguageMapping.get_service_display_name(self.service_type))
     
     def get_service_info(self) -> Dict[str, Any]:
         """Get information about the active service."""
@@ -596,11 +884,12 @@ class TranslationServiceWrapper:
         }
         
         # Add service-specific info
-        if self.service_type == ServiceType.GOOGLE_CLOUD and self.google_service:
-            service_info["google_cloud_configured"] = bool(self.google_service.translate_client)
-            service_info["project_id"] = self.google_service.project_id
-        elif self.service_type == ServiceType.NLLB and self.nllb_service:
-            model_info = self.nllb_service.get_model_info()
+        service = self._services.get(self.service_type)
+        if self.service_type == ServiceType.GOOGLE_CLOUD and service:
+            service_info["google_cloud_configured"] = bool(service.translate_client)
+            service_info["project_id"] = service.project_id
+        elif self.service_type == ServiceType.NLLB and service:
+            model_info = service.get_model_info()
             service_info.update(model_info)
         
         return service_info
@@ -0,0 +1,48 @@
+"""
+Regression tests for translation cache keys in the Google Cloud translation service.
+"""
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("google.cloud.translate_v3")
+
+from src.translation_service import TranslationService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Service with a per-test cache directory and a fake translation backend."""
+    monkeypatch.chdir(tmp_path)
+    # A shared client skips credential setup and the warmup thread
+    monkeypatch.setattr(TranslationService, "_shared_client", object())
+    service = TranslationService()
+
+    def fake_translate(text, target_language, source_language):
+        return {
+            "success": True,
+            "translated_text": f"{target_language}:{text}",
+            "source_language": "en",
+            "target_language": target_language
+        }
+
+    monkeypatch.setattr(service, "_translate_with_google_cloud", fake_translate)
+    return service
+
+
+def test_single_item_batch_does_not_shadow_per_text_entries(service):
+    service.batch_translate(["hello"], "es", filename="report.pdf")
+
+    results = service.batch_translate(["hello", "world"], "es", filename="report.pdf")
+
+    assert all(result["success"] for result in results)
+    assert [result["translated_text"] for result in results] == ["es:hello", "es:world"]
+
+
+def test_single_item_batch_does_not_shadow_translate_text(service):
+    service.batch_translate(["hello"], "es", filename="report.pdf")
+
+    result = service.translate_text("hello", "es", filename="report.pdf")
+
+    assert result["success"]
+    assert result["translated_text"] == "es:hello"